@@ -1,49 +1,22 @@
+import os
+import time
+import uuid
+from pathlib import Path
 import streamlit as st
 import pandas as pd
-import numpy as np
-from io import BytesIO
-
-def format_rupiah(x):
-    if pd.isna(x):
-        return ""
-    # pastikan bisa diubah ke float
-    try:
-        x = float(x)
-    except:
-        return x  # biarin apa adanya kalau bukan angka
-
-    # kalau tidak punya desimal (misal 7000.0), tampilkan tanpa ,00
-    if x.is_integer():
-        formatted = f"{int(x):,}".replace(",", ".")
-    else:
-        formatted = f"{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-        # hapus ,00 kalau desimalnya 0 semua (misal 7000,00 → 7000)
-        if formatted.endswith(",00"):
-            formatted = formatted[:-3]
-    return formatted
-
-def format_rupiah_percent(x):
-    if pd.isna(x):
-        return ""                   # hilangkan None / NaN
-    return f"{format_rupiah(x)}%"   # pakai format_rupiah + %
-
-def highlight_min_cell(row):
-    styles = []
-    
-    # Cari nilai minimum, abaikan NaN
-    numeric_vals = row[row.apply(lambda x: isinstance(x, (int, float)))]
-    if not numeric_vals.empty:
-        min_val = numeric_vals.min()
-    else:
-        min_val = None
-
-    # Buat style per cell
-    for val in row:
-        if val == min_val:
-            styles.append("background-color: #C6EFCE; color: #006100;")
-        else:
-            styles.append("")
-    return styles
+from cache import content_hash
+from profiling import stage
+from consolidate import consolidate_tenders
+from charts import MAX_FACETS, ranking_chart, scope_chart_data, scope_labels
+from deviation import best_rank_mask
+from excel_export import RESULT_SHEETS, STREAM_MIN_CELLS, export_excel_file, generate_multi_sheet_excel
+from jobs import PipelineJob, clear_job, submit_job
+from loader import TenderFormatError, read_tender
+from snapshot import CACHE_DIR, open_snapshot, save_snapshot
+from store import SharedStore
+from tender import TenderTable
+from styling import red_highlight
+from views import paged_table, timing_panel
 
 st.markdown(
     """
@@ -101,11 +74,13 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Dataframe
-columns = ["Scope", "Desc", "Vendor A", "Vendor B", "Vendor C", "Vendor D", "Vendor E"]
-df = pd.DataFrame([[""] * len(columns) for _ in range(3)], columns=columns)
+# Tabel contoh statis: dibuat sekali per process, bukan di setiap rerun
+@st.cache_resource
+def input_structure_example():
+    columns = ["Scope", "Desc", "Vendor A", "Vendor B", "Vendor C", "Vendor D", "Vendor E"]
+    return pd.DataFrame([[""] * len(columns) for _ in range(3)], columns=columns)
 
-st.dataframe(df, hide_index=True)
+st.dataframe(input_structure_example(), hide_index=True)
 
 # Buat DataFrame 1 row
 st.markdown("""
@@ -200,15 +175,17 @@ st.markdown(
 )
 
 # DataFrame
-columns = ["No", "Scope", "Desc", "Vendor A", "Vendor B", "Vendor C"]
-data = [
-    [1] + [""] * (len(columns) - 1),
-    [2] + [""] * (len(columns) - 1),
-    [3] + [""] * (len(columns) - 1)
-]
-df = pd.DataFrame(data, columns=columns)
-
-st.dataframe(df, hide_index=True)
+@st.cache_resource
+def number_column_example():
+    columns = ["No", "Scope", "Desc", "Vendor A", "Vendor B", "Vendor C"]
+    data = [
+        [1] + [""] * (len(columns) - 1),
+        [2] + [""] * (len(columns) - 1),
+        [3] + [""] * (len(columns) - 1)
+    ]
+    return pd.DataFrame(data, columns=columns)
+
+st.dataframe(number_column_example(), hide_index=True)
 
 st.markdown(
     """
@@ -237,23 +214,26 @@ st.markdown(
 )
 
 # DataFrame
-columns = ["", "A", "B", "C", "D", "E", "F", "G"]
+@st.cache_resource
+def floating_table_example():
+    columns = ["", "A", "B", "C", "D", "E", "F", "G"]
 
-# Buat 5 baris kosong
-df = pd.DataFrame([[""] * len(columns) for _ in range(6)], columns=columns)
+    # Buat 5 baris kosong
+    df = pd.DataFrame([[""] * len(columns) for _ in range(6)], columns=columns)
 
-# Isi kolom pertama dengan 1–7
-df.iloc[:, 0] = [1, 2, 3, 4, 5, 6]
+    # Isi kolom pertama dengan 1–7
+    df.iloc[:, 0] = [1, 2, 3, 4, 5, 6]
 
-# Header bagian kedua
-df.loc[1, ["B", "C", "D", "E", "F"]] = ["Scope", "UoM", "Vendor A", "Vendor B", "Vendor C"]
+    # Header bagian kedua
+    df.loc[1, ["B", "C", "D", "E", "F"]] = ["Scope", "UoM", "Vendor A", "Vendor B", "Vendor C"]
 
-# Data Software & Hardware
-df.loc[2, ["B", "C", "D", "E", "F"]] = ["WP1", "Site", "1.000", "2.000", "3.000"]
-df.loc[3, ["B", "C", "D", "E", "F"]] = ["WP2", "Site", "4.800", "5.000", "5.200"]
-df.loc[4, ["B", "C", "D", "E", "F"]] = ["WP3", "Site", "3.650", "3.450", "3.250"]
+    # Data Software & Hardware
+    df.loc[2, ["B", "C", "D", "E", "F"]] = ["WP1", "Site", "1.000", "2.000", "3.000"]
+    df.loc[3, ["B", "C", "D", "E", "F"]] = ["WP2", "Site", "4.800", "5.000", "5.200"]
+    df.loc[4, ["B", "C", "D", "E", "F"]] = ["WP3", "Site", "3.650", "3.450", "3.250"]
+    return df
 
-st.dataframe(df, hide_index=True)
+st.dataframe(floating_table_example(), hide_index=True)
 
 st.markdown(
     """
@@ -278,28 +258,22 @@ st.markdown(
 )
 
 # DataFrame
-columns = ["Scope", "Vendor A", "Vendor B", "Vendor C", "TOTAL"]
-data = [
-    ["WP1", "1.000", "2.000", "3.000", "6.000"],
-    ["WP2", "4.800", "5.000", "5.200", "15.000"],
-    ["TOTAL", "5.800", "7.000", "8.200", "21.000"],
-]
-df = pd.DataFrame(data, columns=columns)
-
-def red_highlight(row):
-    styles = [""] * len(row)
-
-    # Highlight ROW "TOTAL"
-    if row["Scope"] == "TOTAL":
-        styles = ["color: #FF4D4D;" for _ in row]
-    else:
-        # Highlight COLUMN "TOTAL"
-        total_col_index = row.index.get_loc("TOTAL")
-        styles[total_col_index] = "color: #FF4D4D;"
-
-    return styles
-
-df_styled = df.style.apply(red_highlight, axis=1)
+@st.cache_resource
+def total_example():
+    columns = ["Scope", "Vendor A", "Vendor B", "Vendor C", "TOTAL"]
+    data = [
+        ["WP1", "1.000", "2.000", "3.000", "6.000"],
+        ["WP2", "4.800", "5.000", "5.200", "15.000"],
+        ["TOTAL", "5.800", "7.000", "8.200", "21.000"],
+    ]
+    df = pd.DataFrame(data, columns=columns)
+    # CSS hasil red_highlight disimpan; Styler dibungkus ulang per rerun karena
+    # objek Styler tidak aman dirender bersamaan oleh beberapa session
+    styles = df.apply(red_highlight, axis=1, result_type="broadcast")
+    return df, styles
+
+df, styles = total_example()
+df_styled = df.style.apply(lambda _: styles, axis=None)
 
 st.dataframe(df_styled, hide_index=True)
 
@@ -323,9 +297,13 @@ st.markdown("#### What is Displayed?")
 # Path file Excel yang sudah ada
 file_path = "dummy dataset.xlsx"
 
-# Buka file sebagai binary
-with open(file_path, "rb") as f:
-    file_data = f.read()
+# Buka file sebagai binary, sekali per process (bytes dibagi semua session)
+@st.cache_resource
+def load_dummy_dataset(path):
+    with stage("read dummy dataset"), open(path, "rb") as f:
+        return f.read()
+
+file_data = load_dummy_dataset(file_path)
 
 # Markdown teks
 st.markdown(
@@ -352,10 +330,149 @@ st.download_button(
     use_container_width=True,
 )
 
+# Upload opsional, kalau kosong pakai dummy dataset
+uploaded_files = st.file_uploader(
+    "Or try it with your own file:",
+    type=["xlsx", "xls"],
+    accept_multiple_files=True,
+)
+combine_sheets = st.toggle(
+    "Combine all sheets",
+    help="Consolidate every sheet of every uploaded file (e.g. one sheet per region or "
+         "one workbook per vendor) into one table, matched on the non-numeric columns. "
+         "When a workbook has several sheets, the sheet name is added as a leading "
+         "Sheet column, so the same scope in two regions stays two rows.",
+)
+
+# Lebih dari satu file (atau toggle aktif): semua sheet digabung jadi satu tender
+if not uploaded_files:
+    upload_data = file_data
+    file_key = content_hash(file_data)
+elif len(uploaded_files) == 1 and not combine_sheets:
+    upload_data = uploaded_files[0].getvalue()
+    file_key = content_hash(upload_data)
+else:
+    upload_data = [(f.name, f.getvalue()) for f in uploaded_files]
+    file_key = content_hash(
+        b"combine:" + b"".join(content_hash(data).encode() for _, data in upload_data)
+    )
+upload_name = ", ".join(f.name for f in uploaded_files)
+
+# Cara membagi rank kalau ada harga yang sama; vendor tanpa harga tidak dirangking
+TIE_METHODS = {
+    "min": "Same rank, skip next (1, 1, 3)",
+    "dense": "Same rank, no gap (1, 1, 2)",
+    "average": "Average rank (1.5, 1.5, 3)",
+}
+tie_method = st.radio(
+    "Tied bids",
+    options=list(TIE_METHODS),
+    format_func=TIE_METHODS.get,
+    horizontal=True,
+)
+
+# Cache hasil per isi file, dibagi semua session di process ini (analis lain yang
+# membuka tender yang sama tidak hitung ulang / tidak menyimpan salinan sendiri)
+@st.cache_resource
+def get_result_cache():
+    return SharedStore(disk_dir=CACHE_DIR / "store")
+
+result_cache = get_result_cache()
+store_owner = st.session_state.setdefault("store_owner", uuid.uuid4().hex)
+
+def load_table(file_key, data, on_chunk=None, on_part=None):
+    # Snapshot di disk dulu (memmap, cepat), kalau belum ada baru parse Excel-nya
+    tender = open_snapshot(file_key)
+    if tender is None:
+        if isinstance(data, list):
+            # beberapa file / sheet: (nama, bytes) -> satu tabel gabungan
+            tender = consolidate_tenders(data, on_part=on_part)
+        else:
+            tender = TenderTable.from_frame(read_tender(data, on_chunk))
+        try:
+            save_snapshot(file_key, tender)
+        except OSError:
+            pass  # cache disk opsional
+    return tender
+
+def compute_rank_tables(file_key, tender, prev_key, method):
+    # Re-upload dengan sedikit perubahan: pakai hasil upload sebelumnya,
+    # hitung ulang hanya baris yang harganya berubah
+    if prev_key is not None and prev_key != file_key:
+        prev_tender = result_cache.get(("table", prev_key))
+        prev_tables = result_cache.get(("rank", prev_key, method))
+        if prev_tender is not None and prev_tables is not None:
+            return tender.update_rank_tables(prev_tender, prev_tables, method)
+    return tender.rank_tables(method)
+
+def run_pipeline(job, file_key, data, prev_key, method):
+    # Jalan di background thread: jangan panggil st.* di sini
+    job.report("Parsing workbook...", 0.0)
+    tender = result_cache.get_or_compute(
+        ("table", file_key),
+        lambda: load_table(
+            file_key, data,
+            on_chunk=lambda n: job.report(f"Parsing workbook... ({n:,} rows)", 0.7 * n / (n + 50_000)),
+            on_part=lambda done, total: job.report(f"Consolidating sheets... ({done}/{total})", 0.7 * done / total),
+        )
+    )
+    job.report("Ranking bidders and computing deviation...", 0.75)
+    tables = result_cache.get_or_compute(
+        ("rank", file_key, method),
+        lambda: compute_rank_tables(file_key, tender, prev_key, method)
+    )
+    return tender, tables
+
+@st.fragment(run_every=0.5)
+def show_job_progress(job):
+    if job.done:
+        st.rerun()
+    st.progress(job.progress, text=job.stage)
+    if st.button("Cancel", key="cancel_job"):
+        job.cancel()
+
+prev_key = st.session_state.get("last_file_key")
+if not uploaded_files:
+    # Dummy dataset kecil: cukup jalan langsung di script thread
+    clear_job(st.session_state)
+    job = PipelineJob((file_key, tie_method), run_pipeline, file_key, upload_data, prev_key, tie_method)
+    job.run()
+else:
+    # Upload baru menggantikan job lama (bukan antre di belakangnya)
+    job = submit_job(
+        st.session_state, (file_key, tie_method),
+        run_pipeline, file_key, upload_data, prev_key, tie_method
+    )
+    job.wait(timeout=0.3)  # file kecil biasanya sudah selesai
+    if not job.done:
+        show_job_progress(job)
+        st.stop()
+
+if job.status == "failed" and not isinstance(job.error, TenderFormatError):
+    raise job.error
+
+if job.status != "done":
+    if job.status == "cancelled":
+        st.info(f"Processing {upload_name} was cancelled. Showing the dummy dataset instead.")
+        if st.button("Process again"):
+            clear_job(st.session_state)
+            st.rerun()
+    else:
+        st.error(f"{upload_name}: {job.error} Showing the dummy dataset instead.")
+
+    file_key = content_hash(file_data)
+    job = PipelineJob((file_key, tie_method), run_pipeline, file_key, file_data, prev_key, tie_method)
+    job.run()
+    if job.status != "done":
+        raise job.error
+
+tender, (df_bid_rank, df_rank_dev, df_sum_dev, df_stats, df_outliers) = job.result
+st.session_state["last_file_key"] = file_key
+
 st.markdown(
     """
     <div style="text-align: justify; font-size: 15px; margin-bottom: 20px">
-        Based on this dummy dataset, the menu will produce the following results.
+        Based on this dataset, the menu will produce the following results.
     </div>
     """,
     unsafe_allow_html=True
@@ -371,15 +488,7 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# DataFrame
-columns = ["Scope", "Vendor A", "Vendor B", "Vendor C"]
-data = [
-    ["WP1", 1, 2, 3],
-    ["WP2", 3, 1, 2],
-    ["WP3", 3, 2, 1],
-]
-df_bid_rank = pd.DataFrame(data, columns=columns)
-st.dataframe(df_bid_rank, hide_index=True)
+paged_table(df_bid_rank, key="bid_rank")
 
 st.write("")
 st.markdown("**:orange-badge[2. RANK-1 DEVIATION (%)]**")
@@ -394,25 +503,14 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# DataFrame
-columns = ["Scope", "Vendor A", "Vendor B", "Vendor C"]
-data = [
-    ["WP1", 0, 27.35, 27.39],
-    ["WP2", 22.57, 0, 0.07],
-    ["WP3", 130.1, 66.56, 0],
-]
-
-df_rank_dev = pd.DataFrame(data, columns=columns)
 num_cols = df_rank_dev.select_dtypes(include=["number"]).columns
-format_dict = {col: format_rupiah_percent for col in num_cols}
 
-df_rank_dev_styled = (
-    df_rank_dev.style
-    .format(format_dict)
-    .apply(highlight_min_cell, axis=1)
+# Highlight = vendor rank terbaik (ikut aturan tie yang dipilih), sama dengan export
+best_mask = result_cache.get_or_compute(
+    ("best_mask", file_key, tie_method), lambda: best_rank_mask(df_bid_rank)
 )
 
-st.dataframe(df_rank_dev_styled, hide_index=True)
+paged_table(df_rank_dev, key="rank_dev", percent_cols=num_cols, highlight_mask=best_mask)
 
 st.write("")
 st.markdown("**:yellow-badge[3. Summary Deviation (%)]**")
@@ -420,58 +518,56 @@ st.markdown(
     """
         <div style="text-align: justify; font-size: 15px; margin-bottom: 10px; margin-top:-10px;">
             After that, the system will generate a summary that helps users analyze each vendor's rank and 
-            its deviation compared to the first-ranked bidder.
+            its deviation compared to the first-ranked bidder. Vendors with the same price share one rank 
+            column, following the tie rule selected above (a skipped rank stays empty).
         </div>
     """,
     unsafe_allow_html=True
 )
 
-# DataFrame
-columns = ["Scope", "1st Rank", "Best Price", "2nd Rank", "Dev. 2nd to 1st (%)", "3rd Rank", "Dev. 3rd to 1st (%)"]
-data = [
-    ["WP1", "Vendor A", 10310, "Vendor B", 27.35, "Vendor C", 27.39],
-    ["WP2", "Vendor B", 14242, "Vendor C", 0.07, "Vendor A", 22.57],
-    ["WP3", "Vendor C", 3242, "Vendor B", 66.56, "Vendor A", 130.1],
-]
-
-df_sum_dev = pd.DataFrame(data, columns=columns)
-format_dict = {}
+rupiah_cols = []
+percent_cols = []
 
 # Kolom "Best Price"
 if "Best Price" in df_sum_dev.columns:
-    format_dict["Best Price"] = format_rupiah
+    rupiah_cols.append("Best Price")
 
 # Kolom deviasi (%)
 for col in df_sum_dev.columns:
     if col.startswith("Dev. ") and col.endswith("(%)"):
-        format_dict[col] = format_rupiah_percent
-
-df_sum_dev_styled = df_sum_dev.style.format(format_dict)
+        percent_cols.append(col)
 
-st.dataframe(df_sum_dev_styled, hide_index=True)
+paged_table(df_sum_dev, key="sum_dev", rupiah_cols=rupiah_cols, percent_cols=percent_cols)
 
 st.write("")
 st.markdown("**:green-badge[4. VISUALIZATION]**")
 st.markdown(
     """
         <div style="text-align: justify; font-size: 15px; margin-bottom: 10px; margin-top:-10px;">
-            This menu visualizes the ranking for each scope, where the system loops through the tabs based on the number of scopes.
+            This menu visualizes the ranking for each scope. Pick a scope (the list is searchable), or
+            several scopes to compare them side by side; charts are only drawn for the selected scopes.
         </div>
     """,
     unsafe_allow_html=True
 )
 
-tab1, tab2, tab3 = st.tabs(["WP1", "WP2", "WP3"])
+labels = result_cache.get_or_compute(("labels", file_key), lambda: scope_labels(tender))
 
-with tab1:
-    st.image("assets/1.png")
+chart_scopes = st.multiselect(
+    "Scope",
+    options=range(len(labels)),
+    default=[0],
+    format_func=lambda i: labels[i],
+    max_selections=MAX_FACETS,
+)
 
-with tab2:
-    st.image("assets/2.png")
+if chart_scopes:
+    chart = result_cache.get_or_compute(
+        ("chart", file_key, tie_method, tuple(chart_scopes)),
+        lambda: ranking_chart(scope_chart_data(tender, df_bid_rank, chart_scopes, labels))
+    )
+    st.altair_chart(chart, use_container_width=True)
 
-with tab3:
-    st.image("assets/3.png")
-    
 st.write("")
 st.markdown("**:blue-badge[5. SUPER BUTTON]**")
 st.markdown(
@@ -480,17 +576,16 @@ st.markdown(
             Lastly, there is a 
             <span style="background:#FFCB09; padding:2px 4px; border-radius:6px; font-weight:600; font-size: 0.75rem; color: black">Super Button</span> 
             feature where all dataframes generated by the system can be downloaded as a single file with multiple sheets. 
+            Besides the three tables above, the file can include <b>Price Statistics</b> (number of bidders, mean, 
+            median, standard deviation, coefficient of variation and quartiles per scope) and <b>Outlier Flags</b> 
+            (vendors whose price is unusually high or low by z-score or the IQR rule). 
             You can also customize the order of the sheets. The interface looks more or less like this.
         </div>
     """,
     unsafe_allow_html=True
 )
 
-dataframes = {
-    "Bidder's Rank": df_bid_rank,
-    "Rank-1 Deviation (%)": df_rank_dev,
-    "Summary Deviation (%)": df_sum_dev,
-}
+dataframes = dict(zip(RESULT_SHEETS, (df_bid_rank, df_rank_dev, df_sum_dev, df_stats, df_outliers)))
 
 # Tampilkan multiselect
 selected_sheets = st.multiselect(
@@ -499,114 +594,65 @@ selected_sheets = st.multiselect(
     default=list(dataframes.keys())  # default semua dipilih
 )
 
-def generate_multi_sheet_excel(selected_sheets, df_dict):
-    output = BytesIO()
-
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-        for sheet in selected_sheets:
-            df = df_dict[sheet].copy()
-
-            # ========= SPECIAL SHEET =========
-            if sheet == "Rank-1 Deviation (%)":
-                df_to_write = df.copy()
-                numeric_cols = [
-                    c for c in df_to_write.columns
-                    if pd.api.types.is_numeric_dtype(df_to_write[c])
-                ]
-
-                df_to_write.to_excel(writer, index=False, sheet_name=sheet)
-                workbook  = writer.book
-                worksheet = writer.sheets[sheet]
-
-                fmt_pct = workbook.add_format({'num_format': '#,##0.0"%"'})
-                fmt_min = workbook.add_format({
-                    "bg_color": "#D9EAD3",
-                    'num_format': '#,##0.0"%"'
-                })
-
-                # ===== WRITE + FORMAT CELL =====
-                for r, row in enumerate(df_to_write.itertuples(index=False), start=1):
-                    numeric_vals = {
-                        i: val for i, val in enumerate(row)
-                        if df_to_write.columns[i] in numeric_cols and pd.notna(val)
-                    }
-                    min_val = min(numeric_vals.values()) if numeric_vals else None
-
-                    for c, col in enumerate(df_to_write.columns):
-                        val = row[c]
-
-                        if pd.isna(val):
-                            worksheet.write_blank(r, c, None)
-                        elif col in numeric_cols:
-                            fmt = fmt_min if val == min_val else fmt_pct
-                            worksheet.write_number(r, c, val, fmt)
-                        else:
-                            worksheet.write(r, c, val)
-
-                # ===== AUTOFIT (KEEP FORMAT!) =====
-                for i, col in enumerate(df_to_write.columns):
-                    width = max(
-                        len(str(col)),
-                        df_to_write[col].astype(str).map(len).max()
-                    ) + 2
-
-                    worksheet.set_column(
-                        i, i,
-                        width,
-                        fmt_pct if col in numeric_cols else None
-                    )
-
-                continue
-
-            # ========= DEFAULT SHEETS =========
-            df.to_excel(writer, index=False, sheet_name=sheet)
-            workbook  = writer.book
-            worksheet = writer.sheets[sheet]
-
-            fmt_rp  = workbook.add_format({'num_format': '#,##0'})
-            fmt_pct = workbook.add_format({'num_format': '#,##0.0"%"'})
-
-            numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-            pct_cols = [c for c in df.columns if "%" in c]
-
-            # ===== REWRITE CELLS (SAFE) =====
-            for r, row in enumerate(df.itertuples(index=False), start=1):
-                for c, col in enumerate(df.columns):
-                    val = row[c]
-
-                    if pd.isna(val) or (isinstance(val, float) and np.isinf(val)):
-                        worksheet.write_blank(r, c, None)
-                    elif col in pct_cols:
-                        worksheet.write_number(r, c, val, fmt_pct)
-                    elif col in numeric_cols:
-                        worksheet.write_number(r, c, val, fmt_rp)
-                    else:
-                        worksheet.write(r, c, val)
-
-            # ===== AUTOFIT (KEEP FORMAT!) =====
-            for i, col in enumerate(df.columns):
-                width = max(
-                    len(str(col)),
-                    df[col].astype(str).map(len).max()
-                ) + 2
-
-                if col in pct_cols:
-                    worksheet.set_column(i, i, width, fmt_pct)
-                elif col in numeric_cols:
-                    worksheet.set_column(i, i, width, fmt_rp)
-                else:
-                    worksheet.set_column(i, i, width)
-
-    output.seek(0)
-    return output.getvalue()
-
 # ---- DOWNLOAD BUTTON ----
-if selected_sheets:
-    excel_bytes = generate_multi_sheet_excel(selected_sheets, dataframes)
+EXPORT_DIR = CACHE_DIR / "exports"
+EXPORT_TTL_SECONDS = 24 * 60 * 60
 
+def build_excel_file(key, sheets, df_dict):
+    # Workbook besar ditulis langsung ke file (constant_memory) dan dipakai
+    # ulang antar session lewat nama file; tidak ada salinan bytes di store
+    path = EXPORT_DIR / f"{content_hash(repr(key).encode())}.xlsx"
+    try:
+        # dipakai ulang: mtime diperbarui supaya tidak ikut dibersihkan
+        # session lain sebelum dibaca
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    for old in EXPORT_DIR.glob("*.xlsx"):
+        # session lain bisa membersihkan file yang sama lebih dulu
+        try:
+            if time.time() - old.stat().st_mtime > EXPORT_TTL_SECONDS:
+                old.unlink()
+        except OSError:
+            pass
+    tmp = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp.xlsx")
+    try:
+        export_excel_file(sheets, df_dict, tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
+
+def make_excel_builder(file_key, method, sheets, df_dict):
+    # Workbook baru dibangun saat tombol Download diklik, bukan di setiap rerun
+    def build_excel():
+        key = ("excel", file_key, method, sheets)
+        if sum(df_dict[sheet].size for sheet in sheets) >= STREAM_MIN_CELLS:
+            # download_button selalu mengubah data jadi satu bytes (file object
+            # juga dibaca utuh), jadi file dibaca sekali di sini; yang hemat
+            # memori adalah proses menulis workbook-nya
+            return Path(build_excel_file(key, sheets, df_dict)).read_bytes()
+        return result_cache.get_or_compute(key, lambda: generate_multi_sheet_excel(sheets, df_dict))
+    return build_excel
+
+# Tandai hasil yang sedang dipakai session ini supaya tidak dibuang duluan;
+# hasil file / pilihan sebelumnya otomatis dilepas
+result_cache.pin(store_owner, [
+    ("table", file_key),
+    ("rank", file_key, tie_method),
+    ("best_mask", file_key, tie_method),
+    ("labels", file_key),
+    ("chart", file_key, tie_method, tuple(chart_scopes)),
+    ("excel", file_key, tie_method, tuple(selected_sheets)),
+])
+
+if selected_sheets:
     st.download_button(
         label="Download",
-        data=excel_bytes,
+        data=make_excel_builder(file_key, tie_method, tuple(selected_sheets), dataframes),
         file_name="Super Botton - Standard Deviation.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         type="primary",
@@ -628,4 +674,7 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-st.video("https://youtu.be/nS3xERgggqA?si=c3XHqEbMoLENDt62")
\ No newline at end of file
+st.video("https://youtu.be/nS3xERgggqA?si=c3XHqEbMoLENDt62")
+
+# Panel timing di sidebar, hanya kalau STDDEV_PROFILE=1
+timing_panel()
@@ -0,0 +1,143 @@
+"""
+Batch mode: proses satu folder workbook tender tanpa Streamlit.
+
+    python batch.py tenders/ -o results/ -j 8
+
+Setiap .xlsx / .xls di folder input diproses di process pool (parse ->
+rank -> deviation -> Super Button) dan ditulis sebagai
+"<nama file> - Standard Deviation.xlsx". Ringkasan per file disimpan di
+summary.csv di folder output.
+
+    python batch.py vendor_files/ --combine
+
+--combine menggabungkan semua sheet dari semua workbook (mis. satu workbook
+per vendor) jadi satu "Consolidated - Standard Deviation.xlsx". Workbook
+dengan beberapa sheet (satu per region) mendapat kolom key "Sheet".
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from consolidate import consolidate_tenders
+from deviation import RANK_METHODS
+from excel_export import RESULT_SHEETS, export_excel_file
+from loader import read_tender
+from tender import TenderTable
+
+SUMMARY_FIELDS = ["file", "status", "rows", "vendors", "seconds", "output", "error"]
+
+
+def find_workbooks(input_dir):
+    # "~$..." = file lock Excel yang sedang dibuka
+    return sorted(
+        p for p in Path(input_dir).iterdir()
+        if p.suffix.lower() in (".xlsx", ".xls") and not p.name.startswith("~$")
+    )
+
+
+def write_results(tender, output, sheets, method):
+    # Langsung ke file (constant_memory): memori tidak ikut besar sheet-nya
+    dataframes = dict(zip(RESULT_SHEETS, tender.rank_tables(method)))
+    return export_excel_file(sheets, dataframes, output)
+
+
+def process_file(path, output_dir, sheets=RESULT_SHEETS, method="min"):
+    start = time.perf_counter()
+    row = {"file": path.name, "status": "ok", "rows": "", "vendors": "", "output": "", "error": ""}
+    try:
+        tender = TenderTable.from_frame(read_tender(path))
+        output = Path(output_dir) / f"{path.stem} - Standard Deviation.xlsx"
+        write_results(tender, output, sheets, method)
+        row.update(rows=tender.n_rows, vendors=tender.n_vendors, output=output.name)
+    except Exception as e:
+        row.update(status="error", error=f"{type(e).__name__}: {e}")
+
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def run_batch(input_dir, output_dir, jobs=None, sheets=RESULT_SHEETS, method="min"):
+    paths = find_workbooks(input_dir)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(process_file, p, output_dir, sheets, method) for p in paths]
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            print(f"[{row['status']:>5}] {row['file']} ({row['seconds']}s) {row['error']}")
+
+    rows.sort(key=lambda r: r["file"])
+    with open(Path(output_dir) / "summary.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def run_combined(input_dir, output_dir, sheets=RESULT_SHEETS, method="min"):
+    """Semua sheet dari semua workbook di folder -> satu tender gabungan."""
+    paths = find_workbooks(input_dir)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    row = {"file": f"{len(paths)} workbooks", "status": "ok", "rows": "", "vendors": "", "output": "", "error": ""}
+    try:
+        tender = consolidate_tenders([(p.name, p) for p in paths])
+        output = Path(output_dir) / "Consolidated - Standard Deviation.xlsx"
+        write_results(tender, output, sheets, method)
+        row.update(rows=tender.n_rows, vendors=tender.n_vendors, output=output.name)
+    except Exception as e:
+        row.update(status="error", error=f"{type(e).__name__}: {e}")
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    print(f"[{row['status']:>5}] {row['file']} ({row['seconds']}s) {row['error']}")
+
+    with open(Path(output_dir) / "summary.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerow(row)
+    return [row]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Standard Deviation menu on a folder of tender workbooks.")
+    parser.add_argument("input_dir", type=Path)
+    parser.add_argument("-o", "--output-dir", type=Path, default=None, help="default: <input_dir>/output")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument(
+        "--sheet", action="append", choices=RESULT_SHEETS, dest="sheets",
+        help="sheets to include, in order (default: all)",
+    )
+    parser.add_argument(
+        "--ties", choices=RANK_METHODS, default="min",
+        help="how tied bids share a rank (default: min, i.e. 1, 1, 3)",
+    )
+    parser.add_argument(
+        "--combine", action="store_true",
+        help="consolidate every sheet of every workbook into one tender "
+             "(e.g. one workbook per vendor) instead of one result per file",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.input_dir.is_dir():
+        parser.error(f"{args.input_dir} is not a directory")
+
+    output_dir = args.output_dir or args.input_dir / "output"
+    sheets = tuple(args.sheets or RESULT_SHEETS)
+    if args.combine:
+        rows = run_combined(args.input_dir, output_dir, sheets, args.ties)
+    else:
+        rows = run_batch(args.input_dir, output_dir, args.jobs, sheets, args.ties)
+
+    failed = sum(r["status"] != "ok" for r in rows)
+    print(f"\n{len(rows) - failed}/{len(rows)} tenders processed, summary in {output_dir / 'summary.csv'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Benchmark formatting, styling dan export Super Button dengan data tender sintetis.
+
+Jalankan dari root repo (offline, tanpa Streamlit):
+
+    python -m benchmarks.bench                 # bandingkan dengan baseline
+    python -m benchmarks.bench --save          # simpan hasil sebagai baseline
+    python -m benchmarks.bench --quick         # skenario kecil saja
+
+Per stage dicatat waktu (terbaik dari beberapa repeat), throughput sel/detik,
+peak memory (tracemalloc, run terpisah) dan ukuran output dalam bytes.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from deviation import build_rank_tables
+from excel_export import RESULT_SHEETS, export_excel_file, generate_multi_sheet_excel
+from styling import (
+    format_rupiah,
+    format_rupiah_array,
+    format_rupiah_percent,
+    highlight_min_cells,
+    red_highlight,
+)
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# (scope rows, vendors, NaN density)
+SCENARIOS = [
+    (1_000, 5, 0.0),
+    (10_000, 20, 0.05),
+    (50_000, 40, 0.10),
+]
+QUICK_SCENARIOS = SCENARIOS[:1]
+
+
+# ===== DATA SINTETIS =====
+
+def make_tender(rows, vendors, nan_density=0.0, seed=0):
+    """Tabel "Scope + Vendor 1..N" dengan harga acak dan sel kosong (NaN)."""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(1_000, 5_000_000, size=(rows, 1))
+    prices = np.round(base * rng.uniform(0.8, 1.5, size=(rows, vendors)), 2)
+    prices[rng.random(prices.shape) < nan_density] = np.nan
+
+    df = pd.DataFrame(prices, columns=[f"Vendor {i + 1}" for i in range(vendors)])
+    df.insert(0, "Scope", [f"WP{i + 1}" for i in range(rows)])
+    return df
+
+
+def make_total_table(df):
+    """Tender + kolom dan baris TOTAL (contoh layout yang dilarang)."""
+    out = df.copy()
+    num_cols = out.columns[1:]
+    out["TOTAL"] = out[num_cols].sum(axis=1)
+    total = out[list(num_cols) + ["TOTAL"]].sum().to_dict()
+    total["Scope"] = "TOTAL"
+    return pd.concat([out, pd.DataFrame([total])], ignore_index=True)
+
+
+# ===== STAGES =====
+
+def stage_format_rupiah(df, tables):
+    values = df.iloc[:, 1:].to_numpy().ravel()
+    return [format_rupiah(v) for v in values]
+
+
+def stage_format_rupiah_array(df, tables):
+    return format_rupiah_array(df.iloc[:, 1:].to_numpy())
+
+
+def stage_format_percent(df, tables):
+    values = tables[1].iloc[:, 1:].to_numpy().ravel()
+    return [format_rupiah_percent(v) for v in values]
+
+
+def stage_format_percent_array(df, tables):
+    return format_rupiah_array(tables[1].iloc[:, 1:].to_numpy(), percent=True)
+
+
+def stage_highlight_min_cells(df, tables):
+    return highlight_min_cells(tables[1])
+
+
+def stage_red_highlight(df, tables):
+    # sama seperti Styler.apply(red_highlight, axis=1): satu panggilan per baris
+    total = make_total_table(df)
+    return total.apply(red_highlight, axis=1)
+
+
+def stage_rank_tables(df, tables):
+    return build_rank_tables(df)
+
+
+def stage_export(df, tables):
+    # sheet sama dengan stage_export_file supaya kedua stage bisa dibandingkan
+    sheets = dict(zip(RESULT_SHEETS, tables))
+    return generate_multi_sheet_excel(RESULT_SHEETS, sheets)
+
+
+def stage_export_file(df, tables):
+    sheets = dict(zip(RESULT_SHEETS, tables))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_excel_file(RESULT_SHEETS, sheets, os.path.join(tmp, "export.xlsx"))
+        return os.path.getsize(path)  # output_bytes: ukuran file
+
+
+STAGES = {
+    "format_rupiah": stage_format_rupiah,
+    "format_rupiah_array": stage_format_rupiah_array,
+    "format_rupiah_percent": stage_format_percent,
+    "format_rupiah_percent_array": stage_format_percent_array,
+    "highlight_min_cells": stage_highlight_min_cells,
+    "red_highlight": stage_red_highlight,
+    "build_rank_tables": stage_rank_tables,
+    "generate_multi_sheet_excel": stage_export,
+    "export_excel_file": stage_export_file,
+}
+
+
+def output_bytes(result):
+    if isinstance(result, (bytes, bytearray)):
+        return len(result)
+    if isinstance(result, int):
+        return result
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index=False, deep=True).sum())
+    if isinstance(result, tuple):
+        return sum(output_bytes(r) for r in result)
+    if isinstance(result, np.ndarray) and result.dtype == object:
+        return sum(len(v) for v in result.ravel())
+    if isinstance(result, list):
+        return sum(len(v) for v in result)
+    return 0
+
+
+def measure(fn, df, tables, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(df, tables)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(df, tables)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": round(best, 6),
+        "cells_per_second": round(df.shape[0] * (df.shape[1] - 1) / best, 1) if best else None,
+        "peak_memory_bytes": peak,
+        "output_bytes": output_bytes(result),
+    }
+
+
+def run(scenarios, stages, repeat):
+    results = {}
+    for rows, vendors, nan_density in scenarios:
+        df = make_tender(rows, vendors, nan_density)
+        tables = build_rank_tables(df)
+        key = f"{rows}x{vendors}@{nan_density:g}"
+
+        for name in stages:
+            stats = measure(STAGES[name], df, tables, repeat)
+            results[f"{name}/{key}"] = stats
+            print(
+                f"{name:<30} {key:<16} {stats['seconds']:>10.4f}s "
+                f"{stats['cells_per_second']:>14,.0f} cells/s "
+                f"{stats['peak_memory_bytes'] / 1e6:>9.1f} MB peak "
+                f"{stats['output_bytes'] / 1e6:>9.2f} MB out"
+            )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Daftar stage yang lebih lambat / lebih boros dari baseline * tolerance."""
+    regressions = []
+    for key, stats in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_memory_bytes"):
+            if old[metric] and stats[metric] > old[metric] * tolerance:
+                regressions.append(
+                    f"{key}: {metric} {old[metric]} -> {stats[metric]} "
+                    f"({stats[metric] / old[metric]:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="only the smallest scenario")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), help="run only these stages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown factor")
+    args = parser.parse_args(argv)
+
+    scenarios = QUICK_SCENARIOS if args.quick else SCENARIOS
+    results = run(scenarios, args.stage or list(STAGES), args.repeat)
+
+    if args.save:
+        payload = {
+            "python": sys.version.split()[0],
+            "machine": platform.platform(),
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2))
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save to create one.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
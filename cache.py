@@ -0,0 +1,83 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def sizeof(value):
+    """Perkiraan ukuran (bytes) hasil yang disimpan di cache."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage())  # mis. TenderTable
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sum(sizeof(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    LRU cache lintas rerun Streamlit, dibatasi total ukuran (bukan jumlah item).
+    Key biasanya tuple (stage, hash upload, ...), mis. ("excel", h, sheets).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                return default
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self, key, value):
+        size = sizeof(value)
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+
+            # Item yang lebih besar dari cap tidak disimpan sama sekali
+            if size > self.max_bytes:
+                return value
+
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+            self.evict()
+        return value
+
+    def evict(self):
+        # dipanggil dengan lock dipegang; buang yang paling lama tidak dipakai
+        while self.total_bytes > self.max_bytes:
+            _, (_, old_size) = self.entries.popitem(last=False)
+            self.total_bytes -= old_size
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from styling import format_rupiah_array
+
+# Rank 1 merah -> rank terakhir kuning, sama seperti chart lama
+RANK_SCHEME = "yelloworangered"
+MAX_FACETS = 6
+
+
+def scope_labels(tender):
+    """Nama scope untuk pilihan chart: gabungan semua kolom Scope/Desc."""
+    labels = tender.labels.astype("string").fillna("").agg(" | ".join, axis=1)
+    # nama scope bisa dobel, tambahkan nomor baris supaya unik
+    dup = labels.duplicated(keep=False).to_numpy()
+    if dup.any():
+        labels[dup] = labels[dup] + " (row " + (np.flatnonzero(dup) + 1).astype(str) + ")"
+    return labels.tolist()
+
+
+def scope_chart_data(tender, df_bid_rank, rows, labels):
+    """
+    Data long-form (Scope, Vendor, Price, Rank) hanya untuk baris terpilih,
+    diambil langsung dari matriks harga & rank.
+    """
+    vendors = list(tender.vendors)
+    rows = np.asarray(rows)
+    prices = np.asarray(tender.prices[rows], dtype=np.float64)
+    ranks = df_bid_rank[vendors].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    n_rows, n_vendors = prices.shape
+
+    data = pd.DataFrame({
+        "Scope": np.repeat(np.asarray(labels, dtype=object)[rows], n_vendors),
+        "Vendor": np.tile(np.asarray(vendors, dtype=object), n_rows),
+        "Price": prices.ravel(),
+        "Rank": ranks.ravel(),
+    })
+    data = data[data["Price"].notna()].reset_index(drop=True)
+    return data.assign(**{"Price (Rp)": format_rupiah_array(data["Price"].to_numpy())})
+
+
+def ranking_chart(data, title=None):
+    """Bar harga per vendor, warna & label = rank (Comparative Bidder Ranking)."""
+    import altair as alt
+
+    if data.empty:
+        return alt.Chart(pd.DataFrame({"text": ["No prices to chart"]})).mark_text().encode(text="text:N")
+
+    base = alt.Chart().encode(
+        x=alt.X("Vendor:N", sort=None, title=None),
+        y=alt.Y("Price:Q", title=None, axis=alt.Axis(format="~s")),
+    )
+    bars = base.mark_bar().encode(
+        color=alt.Color(
+            "Rank:O",
+            scale=alt.Scale(scheme=RANK_SCHEME, reverse=True),
+            legend=alt.Legend(title="Rank"),
+        ),
+        tooltip=["Vendor:N", "Rank:O", "Price (Rp):N"],
+    )
+    labels = base.mark_text(dy=-8, fontWeight="bold").encode(text="Rank:O")
+
+    chart = alt.layer(bars, labels, data=data)
+    if data["Scope"].nunique() > 1:
+        return chart.properties(width=220, height=180).facet(
+            facet=alt.Facet("Scope:N", sort=None, title=None),
+            columns=3,
+        ).resolve_scale(x="independent", y="independent")
+
+    return chart.properties(title=title or f"{data['Scope'].iloc[0]}: Comparative Bidder Ranking")
@@ -0,0 +1,213 @@
+"""
+Gabungkan tender yang datang terpisah (satu workbook per vendor, satu sheet
+per region, ...) jadi satu TenderTable untuk pipeline ranking.
+
+Setiap sheet dibaca paralel di process pool, lalu baris disejajarkan lewat
+kolom Scope/Desc dengan hash join (pd.Index.get_indexer). Harga langsung
+ditulis ke satu array per vendor; bagian yang sudah digabung dilepas, dan
+jumlah sheet yang sedang dibaca / menunggu digabung dibatasi, jadi memori
+tidak tumbuh dengan jumlah file.
+
+Kalau ada workbook dengan lebih dari satu sheet, sheet dianggap region: nama
+sheet jadi kolom key "Sheet" di depan, jadi WP1 di North dan WP1 di South
+tetap dua baris (workbook vendor lain harus memakai nama sheet yang sama).
+Kalau setiap workbook hanya satu sheet (satu workbook per vendor), baris
+disejajarkan lewat Scope/Desc saja.
+"""
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from deviation import split_columns
+from loader import TenderFormatError, read_tender, sheet_names
+from profiling import timed
+from tender import TenderTable
+
+KEY_SEP = "\x1f"
+SHEET_COLUMN = "Sheet"
+# bagian yang boleh sedang dibaca / menunggu digabung sekaligus, per worker
+PENDING_PER_WORKER = 2
+POOL = None
+
+
+def get_pool():
+    # Pool dibuat sekali per process lalu dipakai ulang antar upload.
+    # "spawn" karena server Streamlit punya banyak thread (fork tidak aman).
+    global POOL
+    if POOL is None:
+        POOL = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return POOL
+
+
+def list_parts(sources, all_sheets=True):
+    """
+    sources: list (nama, bytes / path). Return list (data, sheet, label, region),
+    satu per sheet yang akan digabung, sesuai urutan file lalu urutan tab.
+    region = nama sheet kalau sheet jadi bagian key (lihat docstring modul),
+    selain itu None.
+    """
+    books = []
+    for name, data in sources:
+        try:
+            sheets = sheet_names(data) if all_sheets else [0]
+        except TenderFormatError as e:
+            raise TenderFormatError(f"{name}: {e}") from e
+        books.append((name, data, sheets))
+
+    by_region = any(len(sheets) > 1 for _, _, sheets in books)
+    parts = []
+    for name, data, sheets in books:
+        for sheet in sheets:
+            label = name if not all_sheets else f"{name} / {sheet}"
+            parts.append((data, sheet, label, str(sheet) if by_region else None))
+    return parts
+
+
+def read_part(data, sheet):
+    """Worker: satu sheet -> (Scope/Desc, nama vendor, matriks harga)."""
+    df_key, df_price = split_columns(read_tender(data, sheet=sheet))
+    return df_key, list(df_price.columns), df_price.to_numpy(dtype=np.float64)
+
+
+def join_keys(df_key):
+    """
+    Key hash join per baris: gabungan Scope/Desc + nomor kemunculan, supaya
+    scope yang sama muncul dua kali di satu sheet tetap jadi dua baris.
+    """
+    text = df_key.astype("string").fillna("")
+    key = text.iloc[:, 0]
+    for col in text.columns[1:]:
+        key = key + KEY_SEP + text[col]
+    occurrence = key.groupby(key, sort=False).cumcount().astype("string")
+    return pd.Index((key + KEY_SEP + occurrence).to_numpy(dtype=object))
+
+
+def grow(values, capacity):
+    out = np.full(capacity, np.nan)
+    out[:len(values)] = values
+    return out
+
+
+@timed("consolidate_tenders", rows=lambda tender: tender.n_rows)
+def consolidate_tenders(sources, all_sheets=True, parallel=True, on_part=None):
+    """
+    Satu TenderTable dari banyak sheet / file. Vendor yang sama di beberapa
+    bagian (mis. sheet per region) digabung; vendor yang sama menawar dua
+    harga berbeda untuk scope yang sama dianggap error.
+    on_part(done, total) dipanggil setiap satu bagian selesai digabung.
+    """
+    parts = list_parts(sources, all_sheets)
+    if not parts:
+        raise TenderFormatError("There are no sheets to consolidate.")
+
+    key_cols = None
+    keys = pd.Index([], dtype=object)
+    label_parts = []
+    vendors = {}  # nama vendor -> array harga (kapasitas tumbuh 2x)
+    n_rows = capacity = 0
+
+    def merge(label, region, df_key, vendor_names, prices):
+        nonlocal key_cols, keys, n_rows, capacity
+
+        if region is not None:
+            if SHEET_COLUMN in df_key.columns:
+                raise TenderFormatError(
+                    f'{label}: a "{SHEET_COLUMN}" column clashes with the sheet name column '
+                    "added when sheets are combined."
+                )
+            df_key = df_key.copy()
+            df_key.insert(0, SHEET_COLUMN, region)
+
+        if key_cols is None:
+            key_cols = list(df_key.columns)
+        elif list(df_key.columns) != key_cols:
+            raise TenderFormatError(
+                f"{label}: non-numeric columns {list(df_key.columns)} do not match {key_cols}."
+            )
+
+        # ===== HASH JOIN KE BARIS GABUNGAN =====
+        part_keys = join_keys(df_key)
+        rows = keys.get_indexer(part_keys)
+        new = rows < 0
+        if new.any():
+            rows[new] = np.arange(n_rows, n_rows + new.sum())
+            keys = keys.append(part_keys[new])
+            label_parts.append(df_key[new])
+            n_rows += int(new.sum())
+
+        if n_rows > capacity:
+            capacity = max(n_rows, 2 * capacity)
+            for name in vendors:
+                vendors[name] = grow(vendors[name], capacity)
+
+        # ===== TULIS HARGA PER VENDOR =====
+        for j, name in enumerate(vendor_names):
+            column = vendors.setdefault(name, np.full(capacity, np.nan))
+            values = prices[:, j]
+            quoted = ~np.isnan(values)
+            target = rows[quoted]
+            existing = column[target]
+            clash = ~np.isnan(existing) & (existing != values[quoted])
+            if clash.any():
+                scope = df_key.iloc[np.flatnonzero(quoted)[np.argmax(clash)]].tolist()
+                raise TenderFormatError(
+                    f"{label}: {name} has a different price for {' | '.join(map(str, scope))} "
+                    "in another sheet or file."
+                )
+            column[target] = values[quoted]
+
+    # ===== BACA PARALEL, GABUNG BERURUTAN =====
+    # Hasil digabung sesuai urutan bagian (hasil deterministik); jumlah yang
+    # di-submit dibatasi supaya bagian yang sudah selesai tidak menumpuk
+    if parallel and len(parts) > 1 and (os.cpu_count() or 1) > 1:
+        pool = get_pool()
+        window = PENDING_PER_WORKER * (os.cpu_count() or 1)
+        todo = iter(parts)
+        pending = deque()
+        try:
+            for done in range(1, len(parts) + 1):
+                while len(pending) < window:
+                    part = next(todo, None)
+                    if part is None:
+                        break
+                    data, sheet, label, region = part
+                    pending.append((label, region, pool.submit(read_part, data, sheet)))
+                label, region, future = pending.popleft()
+                merge(label, region, *future_result(label, future))
+                if on_part is not None:
+                    on_part(done, len(parts))
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+    else:
+        for done, (data, sheet, label, region) in enumerate(parts, 1):
+            try:
+                result = read_part(data, sheet)
+            except TenderFormatError as e:
+                raise TenderFormatError(f"{label}: {e}") from e
+            merge(label, region, *result)
+            if on_part is not None:
+                on_part(done, len(parts))
+
+    # ===== MATRIKS AKHIR (satu kolom dilepas setiap kali disalin) =====
+    names = list(vendors)
+    prices = np.empty((n_rows, len(names)))
+    for j, name in enumerate(names):
+        prices[:, j] = vendors.pop(name)[:n_rows]
+
+    df_key = pd.concat(label_parts, ignore_index=True)
+    return TenderTable.from_parts(df_key, names, prices)
+
+
+def future_result(label, future):
+    try:
+        return future.result()
+    except TenderFormatError as e:
+        raise TenderFormatError(f"{label}: {e}") from e
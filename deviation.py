@@ -0,0 +1,402 @@
+import pandas as pd
+import numpy as np
+
+from profiling import timed
+
+
+def ordinal(n):
+    # 1 -> 1st, 2 -> 2nd, 11 -> 11th, 23 -> 23rd
+    if 10 <= n % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+def is_number_column(series):
+    return (
+        pd.api.types.is_numeric_dtype(series)
+        and not pd.api.types.is_bool_dtype(series)
+    )
+
+
+def split_columns(df):
+    """Pisahkan tabel jadi (non-numeric, numeric) berdasarkan index kolom."""
+    is_num = [pd.api.types.is_numeric_dtype(df[c]) for c in df.columns]
+    if True not in is_num:
+        raise ValueError("The table has no numeric (vendor) columns.")
+
+    first_num = is_num.index(True)
+    return df.iloc[:, :first_num], df.iloc[:, first_num:]
+
+
+# Cara membagi rank kalau harga sama (tie):
+#   min      1, 1, 3   (standar kompetisi, default)
+#   dense    1, 1, 2
+#   average  1.5, 1.5, 3
+#   first    1, 2, 3   (urutan kolom vendor, perilaku lama)
+RANK_METHODS = ("min", "dense", "average", "first")
+
+# Outlier per vendor (per baris):
+#   z    |harga - mean| / std > Z_SCORE_LIMIT (std sampel, ddof=1); dengan n
+#        bidder |z| maksimal (n-1)/sqrt(n), jadi baru bisa kena mulai 6 bidder
+#   IQR  di luar [Q1 - k*IQR, Q3 + k*IQR], k = IQR_FENCE
+Z_SCORE_LIMIT = 2.0
+IQR_FENCE = 1.5
+# Kategori sheet Outlier Flags: 3 * (di atas median) + kode metode - 1,
+# kode metode 1 = z, 2 = IQR, 3 = keduanya
+OUTLIER_LABELS = (
+    "Low (z)", "Low (IQR)", "Low (z, IQR)", "High (z)", "High (IQR)", "High (z, IQR)",
+)
+
+
+def build_rank_tables(df, method="min"):
+    """
+    Hitung Bidder's Rank, Rank-1 Deviation (%), Summary Deviation (%),
+    Price Statistics dan Outlier Flags dari tabel "Scope/Desc + Vendor A..N"
+    sekaligus untuk semua baris.
+    """
+    df_key, df_price = split_columns(df)
+    return rank_tables_from_arrays(
+        df_key, df_price.columns, df_price.to_numpy(dtype=np.float64), method
+    )
+
+
+def rank_prices(prices, method="min"):
+    """
+    Rank per baris untuk seluruh matriks sekaligus (satu argsort, O(k log k)
+    per baris). Vendor yang tidak menawar (NaN) tidak ikut dirangking.
+
+    Return (ranks, order, n_bids):
+      ranks   float64 (n_rows x n_vendors), NaN untuk non-bidder
+      order   argsort stabil per baris, NaN selalu di belakang
+      n_bids  jumlah vendor yang menawar per baris
+    """
+    if method not in RANK_METHODS:
+        raise ValueError(f"Unknown rank method {method!r}, expected one of {RANK_METHODS}.")
+
+    prices = np.asarray(prices, dtype=np.float64)
+    n_rows, n_vendors = prices.shape
+    order = np.argsort(prices, axis=1, kind="stable")
+    sorted_prices = np.take_along_axis(prices, order, axis=1)
+    bid = ~np.isnan(sorted_prices)
+    n_bids = bid.sum(axis=1)
+
+    position = np.broadcast_to(np.arange(1, n_vendors + 1, dtype=np.float64), (n_rows, n_vendors))
+    if method == "first" or n_vendors == 0:
+        sorted_ranks = position.copy()
+    else:
+        # awal tiap kelompok harga yang sama (di urutan terurut)
+        starts = np.ones((n_rows, n_vendors), dtype=bool)
+        starts[:, 1:] = sorted_prices[:, 1:] != sorted_prices[:, :-1]
+
+        if method == "dense":
+            sorted_ranks = np.cumsum(starts, axis=1).astype(np.float64)
+        else:
+            sorted_ranks = np.maximum.accumulate(np.where(starts, position, 0), axis=1)
+            if method == "average":
+                ends = np.ones((n_rows, n_vendors), dtype=bool)
+                ends[:, :-1] = starts[:, 1:]
+                last = np.where(ends, position, np.inf)[:, ::-1]
+                last = np.minimum.accumulate(last, axis=1)[:, ::-1]
+                sorted_ranks = (sorted_ranks + last) / 2
+
+    sorted_ranks = np.where(bid, sorted_ranks, np.nan)
+    ranks = np.empty((n_rows, n_vendors), dtype=np.float64)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=1)
+    return ranks, order, n_bids
+
+
+def sorted_quantile(sorted_prices, n_bids, q):
+    """
+    Quantile per baris dari harga yang sudah diurutkan (NaN di belakang),
+    interpolasi linear seperti np.nanquantile / pandas, tanpa sort ulang.
+    """
+    position = (n_bids - 1) * q
+    lo = np.maximum(np.floor(position).astype(np.intp), 0)  # n_bids = 0 -> -1
+    hi = np.maximum(np.ceil(position).astype(np.intp), 0)
+    lo_value = np.take_along_axis(sorted_prices, lo[:, None], axis=1)[:, 0]
+    hi_value = np.take_along_axis(sorted_prices, hi[:, None], axis=1)[:, 0]
+    out = lo_value + (hi_value - lo_value) * (position - lo)
+    out[n_bids == 0] = np.nan
+    return out
+
+
+def price_statistics(prices, sorted_prices, n_bids):
+    """
+    Statistik harga per baris (NaN = vendor tidak menawar, tidak dihitung),
+    memakai urutan yang sama dengan ranking. Return (stats, flags):
+      stats  dict kolom: Bidders, Mean, Median, Std. Deviation (ddof=1),
+             CV (%), Q1, Q3, Outliers
+      flags  int8 (n_rows x n_vendors): kode OUTLIER_LABELS, -1 = bukan outlier
+    """
+    if sorted_prices.shape[1] == 0:
+        sorted_prices = np.full((len(n_bids), 1), np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nansum(sorted_prices, axis=1) / n_bids
+        deviation = prices - mean[:, None]
+        std = np.sqrt(np.nansum(deviation * deviation, axis=1) / (n_bids - 1))
+        std[n_bids < 2] = np.nan
+        cv = std / mean * 100
+
+        median = sorted_quantile(sorted_prices, n_bids, 0.5)
+        q1 = sorted_quantile(sorted_prices, n_bids, 0.25)
+        q3 = sorted_quantile(sorted_prices, n_bids, 0.75)
+        fence = IQR_FENCE * (q3 - q1)
+
+        # ===== OUTLIER PER VENDOR =====
+        # std = 0 (semua harga sama) -> z NaN, tidak ada yang ditandai
+        z_flag = np.abs(deviation) > Z_SCORE_LIMIT * std[:, None]
+        iqr_flag = (prices < (q1 - fence)[:, None]) | (prices > (q3 + fence)[:, None])
+        above = prices > median[:, None]
+
+    code = z_flag.view(np.int8) + 2 * iqr_flag.view(np.int8)
+    flags = np.where(code > 0, 3 * above.view(np.int8) + code - 1, -1).astype(np.int8)
+
+    stats = {
+        "Bidders": n_bids,
+        "Mean Price": mean,
+        "Median Price": median,
+        "Std. Deviation": std,
+        "CV (%)": cv,
+        "Q1": q1,
+        "Q3": q3,
+        "Outliers": np.count_nonzero(code, axis=1),
+    }
+    return stats, flags
+
+
+def rank_slots(sorted_prices, n_bids, method="min"):
+    """
+    Kolom Summary Deviation ("1st Rank" = 0, ...) untuk setiap posisi di urutan
+    harga, mengikuti method: vendor yang tie berbagi satu kolom, yaitu rank-nya
+    di Bidder's Rank (min / dense / first). "average" memakai rank terkecil
+    kelompoknya (1.5, 1.5 -> kolom "1st Rank").
+    Return (slot, starts): starts = posisi pertama tiap kelompok harga sama,
+    hanya untuk vendor yang menawar.
+    """
+    n_rows, n_vendors = sorted_prices.shape
+    position = np.arange(n_vendors)
+    starts = np.ones((n_rows, n_vendors), dtype=bool)
+    if method != "first":
+        starts[:, 1:] = sorted_prices[:, 1:] != sorted_prices[:, :-1]
+    if method == "dense":
+        slot = np.cumsum(starts, axis=1) - 1
+    else:
+        slot = np.maximum.accumulate(np.where(starts, position, 0), axis=1)
+    starts &= position < n_bids[:, None]
+    return slot, starts
+
+
+def tie_categories(vendors, order, slot, starts, n_bids, vendor_codes):
+    """
+    Kelompok harga sama dengan >= 2 vendor -> kategori "A, B" tambahan.
+    Urutan anggota kelompok = urutan index vendor (argsort stabil), jadi
+    kelompok cukup dikenali dari bitmask anggotanya (uint64 per 64 vendor,
+    OR per kelompok lewat reduceat). np.unique atas bitmask memberi kombinasi
+    unik, dan nama hanya dibuat sekali per kombinasi (join_groups). Kode kategori
+    (len(vendors) + i) ditulis langsung ke vendor_codes.
+    """
+    n_vendors = len(vendors)
+    rows, pos = np.nonzero(np.arange(n_vendors) < n_bids[:, None])
+    first = np.flatnonzero(starts[rows, pos])  # starts[r, 0] selalu True kalau ada tawaran
+    size = np.diff(np.append(first, rows.size))
+    tied = size > 1
+    if not tied.any():
+        return []
+
+    # ===== BITMASK ANGGOTA PER KELOMPOK =====
+    members = order[rows, pos]
+    bits = np.zeros((rows.size, (n_vendors + 63) // 64), dtype=np.uint64)
+    bits[np.arange(rows.size), members // 64] = np.left_shift(
+        np.uint64(1), (members % 64).astype(np.uint64)
+    )
+    masks = np.bitwise_or.reduceat(bits, first, axis=0)[tied]
+    if masks.shape[1] == 1:
+        unique, index, inverse = np.unique(masks[:, 0], return_index=True, return_inverse=True)
+    else:
+        unique, index, inverse = np.unique(masks, axis=0, return_index=True, return_inverse=True)
+
+    head, length = first[tied], size[tied]
+    names = join_groups(vendors, members, head[index], length[index])
+    vendor_codes[rows[head], slot[rows[head], pos[head]]] = n_vendors + inverse.ravel()
+    return names
+
+
+def join_groups(vendors, members, head, length):
+    """
+    Nama "A, B" untuk setiap kelompok members[head:head + length] dengan satu
+    str.join + split (tanpa join per kelompok di Python).
+    """
+    # "\0" tidak mungkin ada di nama vendor (XML di .xlsx tidak mengizinkannya)
+    names = np.array([str(v) for v in vendors], dtype=object)
+    take = np.repeat(head - np.cumsum(length) + length, length) + np.arange(length.sum())
+    parts = np.empty(2 * take.size, dtype=object)
+    parts[0::2] = names[members[take]]
+    parts[1::2] = ", "
+    parts[2 * np.cumsum(length) - 1] = "\0"  # akhir kelompok
+    return "".join(parts).split("\0")[:-1]
+
+
+def rank_column(values, method):
+    """Rank integer (min/dense/first) jadi Int64 supaya non-bidder tampil kosong."""
+    if method == "average":
+        return values
+    missing = np.isnan(values)
+    return pd.arrays.IntegerArray(np.where(missing, 0, values).astype(np.int64), missing)
+
+
+@timed("rank_tables", rows=lambda tables: len(tables[0]))
+def rank_tables_from_arrays(df_key, vendor_names, prices, method="min"):
+    """
+    Sama seperti build_rank_tables, tapi langsung dari matriks harga
+    (n_rows x n_vendors), mis. memmap dari snapshot, tanpa copy ke DataFrame.
+
+    Return (df_bid_rank, df_rank_dev, df_sum_dev, df_stats, df_outliers);
+    dua terakhir = statistik harga per scope dan flag outlier per vendor,
+    dihitung dari hasil sort yang sama dengan ranking.
+    """
+    vendors = np.asarray(vendor_names, dtype=object)
+    vendor_cols = list(vendor_names)
+    prices = np.asarray(prices, dtype=np.float64)
+    n_vendors = prices.shape[1]
+
+    # ===== RANK (argsort di sumbu vendor) =====
+    ranks, order, n_bids = rank_prices(prices, method)
+
+    # ===== DEVIATION DARI RANK 1 =====
+    sorted_prices = np.take_along_axis(prices, order, axis=1)
+    best = sorted_prices[:, :1]  # NaN di belakang, jadi kolom 0 = harga termurah
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = (prices - best) / best * 100
+        sorted_dev = (sorted_prices - best) / best * 100
+
+    df_bid_rank = pd.concat(
+        [df_key, pd.DataFrame(
+            {col: rank_column(ranks[:, i], method) for i, col in enumerate(vendor_cols)},
+            index=df_key.index,
+        )],
+        axis=1
+    )
+    df_rank_dev = pd.concat(
+        [df_key, pd.DataFrame(deviation, columns=vendor_cols, index=df_key.index)],
+        axis=1
+    )
+
+    # ===== SUMMARY =====
+    # Kolom "kth Rank" = vendor dengan rank k di Bidder's Rank (ikut method);
+    # vendor yang tie digabung di satu sel, kolom rank yang dilewati kosong.
+    # Non-bidder tidak muncul di summary.
+    slot, starts = rank_slots(sorted_prices, n_bids, method)
+    rows, pos = np.nonzero(starts)
+    cols = slot[rows, pos]
+    # nama vendor sebagai categorical (kode = index vendor, -1 = kosong)
+    vendor_codes = np.full((len(prices), n_vendors), -1, dtype=np.int64)
+    vendor_codes[rows, cols] = order[rows, pos]
+    slot_prices = np.full((len(prices), n_vendors), np.nan)
+    slot_prices[rows, cols] = sorted_prices[rows, pos]
+    slot_dev = np.full((len(prices), n_vendors), np.nan)
+    slot_dev[rows, cols] = sorted_dev[rows, pos]
+
+    # kelompok tie: nama digabung jadi kategori tambahan, satu per kombinasi
+    # vendor yang unik (bukan per baris)
+    tie_names = tie_categories(vendors, order, slot, starts, n_bids, vendor_codes)
+    categories = list(vendors) + tie_names
+
+    # satu dtype untuk semua kolom: kategori divalidasi sekali, bukan per kolom
+    vendor_dtype = pd.CategoricalDtype(categories)
+    summary = {col: df_key[col].array for col in df_key.columns}
+    for i in range(n_vendors):
+        rank_name = ordinal(i + 1)
+        summary[f"{rank_name} Rank"] = pd.Categorical.from_codes(
+            vendor_codes[:, i], dtype=vendor_dtype, validate=False
+        )
+        if i == 0:
+            summary["Best Price"] = slot_prices[:, 0]
+        else:
+            summary[f"Dev. {rank_name} to 1st (%)"] = slot_dev[:, i]
+
+    df_sum_dev = pd.DataFrame(summary, index=df_key.index)
+
+    # ===== STATISTIK HARGA & OUTLIER =====
+    stats, flags = price_statistics(prices, sorted_prices, n_bids)
+    df_stats = pd.concat([df_key, pd.DataFrame(stats, index=df_key.index)], axis=1)
+    df_outliers = pd.concat(
+        [df_key, pd.DataFrame(
+            {col: pd.Categorical.from_codes(flags[:, i], categories=OUTLIER_LABELS)
+             for i, col in enumerate(vendor_cols)},
+            index=df_key.index,
+        )],
+        axis=1
+    )
+
+    return df_bid_rank, df_rank_dev, df_sum_dev, df_stats, df_outliers
+
+
+def best_rank_mask(df_bid_rank):
+    """
+    Mask (n_rows x n_cols) vendor terbaik per baris menurut hasil ranking
+    (rank terkecil; semua yang tie ikut kecuali method "first").
+    Dipakai bersama oleh highlight di UI dan di export Excel.
+    """
+    num_idx = [i for i, col in enumerate(df_bid_rank.columns) if is_number_column(df_bid_rank[col])]
+    mask = np.zeros(df_bid_rank.shape, dtype=bool)
+    if num_idx:
+        ranks = df_bid_rank.iloc[:, num_idx].to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(invalid="ignore"):
+            mask[:, num_idx] = ranks == np.fmin.reduce(ranks, axis=1)[:, None]
+    return mask
+
+
+def row_min_mask(df):
+    """Mask (n_rows x n_cols): True di sel numeric termurah per baris, NaN diabaikan."""
+    num_idx = [i for i, col in enumerate(df.columns) if is_number_column(df[col])]
+    mask = np.zeros(df.shape, dtype=bool)
+    if num_idx:
+        values = df.iloc[:, num_idx].to_numpy(dtype=np.float64)
+        row_min = np.fmin.reduce(values, axis=1)
+        mask[:, num_idx] = values == row_min[:, None]
+    return mask
+
+
+def changed_rows(old_prices, new_prices):
+    """Index baris yang harganya berubah (NaN dianggap sama dengan NaN)."""
+    same = (old_prices == new_prices) | (np.isnan(old_prices) & np.isnan(new_prices))
+    return np.flatnonzero(~same.all(axis=1))
+
+
+def splice_rows(table, rows, sub, skip=()):
+    out = table.copy()
+    for col in out.columns:
+        if col in skip:
+            continue
+        values = out[col].array.copy()  # .array: rank Int64 tetap Int64
+        part = sub[col].array
+        if isinstance(values, pd.Categorical):
+            # kategori bisa beda (nama vendor yang tie digabung di summary)
+            values = values.add_categories(part.categories.difference(values.categories))
+            part = part.set_categories(values.categories)
+            values[rows] = part
+            values = values.remove_unused_categories()
+        else:
+            values[rows] = part
+        out[col] = values
+    return out
+
+
+@timed("update_rank_tables", rows=lambda tables: len(tables[0]))
+def update_rank_tables(tables, df_key, vendor_names, prices, rows, method="min"):
+    """
+    Hitung ulang hanya baris `rows` lalu tempel ke hasil sebelumnya.
+    Aman karena rank, deviasi & statistik dihitung per baris (tidak ada ketergantungan
+    antar baris). Kolom Scope/Desc dianggap tidak berubah.
+    """
+    if len(rows) == 0:
+        return tables
+
+    sub = rank_tables_from_arrays(df_key.iloc[rows], vendor_names, prices[rows], method)
+    return tuple(
+        splice_rows(table, rows, part, skip=df_key.columns)
+        for table, part in zip(tables, sub)
+    )
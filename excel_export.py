@@ -0,0 +1,303 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from deviation import best_rank_mask, is_number_column, row_min_mask
+from profiling import stage
+
+BID_RANK_SHEET = "Bidder's Rank"
+RANK_DEV_SHEET = "Rank-1 Deviation (%)"
+RESULT_SHEETS = (
+    BID_RANK_SHEET, RANK_DEV_SHEET, "Summary Deviation (%)", "Price Statistics", "Outlier Flags",
+)
+
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+RP_FORMAT = {"num_format": "#,##0"}
+PCT_FORMAT = {"num_format": '#,##0.0"%"'}
+RANK_FORMAT = {"num_format": "General"}  # rank "average" bisa 1.5
+MIN_FORMAT = {"bg_color": "#D9EAD3", "num_format": '#,##0.0"%"'}
+
+# Di atas ini app menulis workbook ke file (constant_memory), bukan ke BytesIO
+STREAM_MIN_CELLS = 1_000_000
+# Baris per blok yang diubah ke object Python sekaligus saat streaming
+STREAM_CHUNK_ROWS = 4096
+
+
+def column_values(series):
+    """Satu kolom -> list siap tulis; NaN / inf jadi None (blank cell)."""
+    if is_number_column(series):
+        values = series.to_numpy(dtype=np.float64)
+        out = values.astype(object)
+        out[~np.isfinite(values)] = None
+        return out.tolist()
+
+    out = series.to_numpy(dtype=object, copy=True)
+    out[pd.isna(out)] = None
+    return out.tolist()
+
+
+def column_kinds(sheet, df):
+    """Format per kolom: "pct", "rp", "rank" atau None (teks)."""
+    kinds = []
+    for col in df.columns:
+        if not is_number_column(df[col]):
+            kinds.append(None)
+        elif sheet == BID_RANK_SHEET:
+            kinds.append("rank")
+        elif sheet == RANK_DEV_SHEET or "%" in str(col):
+            kinds.append("pct")
+        else:
+            kinds.append("rp")
+    return kinds
+
+
+def number_width(values, kind):
+    """
+    Lebar teks angka terpanjang seperti yang tampil di Excel:
+    "#,##0" -> 1.234.567, '#,##0.0"%"' -> 1.234,5%
+    """
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return 0
+
+    if kind == "rank":
+        # "General": tanpa pemisah ribuan; rank "average" bisa x.5
+        n_digits = 1 + int(np.floor(np.log10(max(np.abs(values).max(), 1))))
+        return n_digits + 2 * bool((values != np.floor(values)).any())
+
+    decimals = 1 if kind == "pct" else 0
+    extremes = np.round(np.array([values.min(), values.max()]), decimals)
+    magnitude = np.abs(extremes)
+    n_digits = 1 + np.floor(np.log10(np.maximum(magnitude, 1))).astype(int)
+    widths = n_digits + (n_digits - 1) // 3 + (extremes < 0)
+    if kind == "pct":
+        widths = widths + 3  # ".d" dan "%"
+    return int(widths.max())
+
+
+def text_width(series, sample=None):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # panjang per kategori, dicari lewat kode (sel kosong = -1, tidak dihitung)
+        codes = series.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        if codes.size == 0:
+            return 0
+        lengths = series.cat.categories.astype(str).str.len().to_numpy()
+        return int(lengths[codes].max())
+
+    if sample is not None and len(series) > sample:
+        series = series.sample(sample, random_state=0)
+    lengths = series.str.len() if series.dtype == object else series.astype(str).str.len()
+    width = lengths.max()
+    return 0 if pd.isna(width) else int(width)
+
+
+def column_widths(df, kinds, sample=None):
+    widths = []
+    for col, kind in zip(df.columns, kinds):
+        if kind is None:
+            width = text_width(df[col], sample)
+        else:
+            width = number_width(df[col].to_numpy(dtype=np.float64), kind)
+        widths.append(max(len(str(col)), width) + 2)
+    return widths
+
+
+def prepare_sheet(sheet, df, width_sample=None, min_mask=None):
+    """
+    Semua kerja per sheet yang tidak butuh xlsxwriter: nilai per kolom,
+    jenis format, lebar kolom dan posisi sel termurah.
+    min_mask: sel yang di-highlight di Rank-1 Deviation (best_rank_mask);
+    kalau None dihitung dari nilai terkecil per baris.
+    """
+    kinds = column_kinds(sheet, df)
+
+    # ===== BEST BID PER ROW (khusus Rank-1 Deviation) =====
+    min_rows = [[] for _ in kinds]
+    if sheet == RANK_DEV_SHEET:
+        if min_mask is None:
+            min_mask = row_min_mask(df)
+        for c, kind in enumerate(kinds):
+            if kind is not None:
+                min_rows[c] = np.flatnonzero(min_mask[:, c]).tolist()
+
+    # ===== AUTOFIT (tanpa ubah semua sel jadi string) =====
+    widths = column_widths(df, kinds, width_sample)
+
+    return {
+        "name": sheet,
+        "header": [str(c) for c in df.columns],
+        "columns": [column_values(df[col]) for col in df.columns],
+        "kinds": kinds,
+        "widths": widths,
+        "min_rows": min_rows,
+    }
+
+
+def write_sheet(workbook, formats, payload):
+    worksheet = workbook.add_worksheet(payload["name"])
+    kinds = payload["kinds"]
+
+    worksheet.write_row(0, 0, payload["header"], formats["header"])
+
+    # ===== WRITE PER COLUMN =====
+    for c, values in enumerate(payload["columns"]):
+        worksheet.write_column(1, c, values, formats.get(kinds[c]))
+
+        for r in payload["min_rows"][c]:
+            if values[r] is not None:
+                worksheet.write_number(r + 1, c, values[r], formats["min"])
+
+    # ===== SET WIDTH (KEEP FORMAT!) =====
+    for i, width in enumerate(payload["widths"]):
+        worksheet.set_column(i, i, width, formats.get(kinds[i]))
+
+
+def sheet_masks(selected_sheets, df_dict):
+    # Highlight mengikuti hasil ranking (sama dengan UI), bukan dicari ulang
+    rank_mask = None
+    if RANK_DEV_SHEET in selected_sheets and BID_RANK_SHEET in df_dict:
+        rank_mask = best_rank_mask(df_dict[BID_RANK_SHEET])
+    return [rank_mask if sheet == RANK_DEV_SHEET else None for sheet in selected_sheets]
+
+
+def add_formats(workbook):
+    return {
+        "header": workbook.add_format(HEADER_FORMAT),
+        "rp": workbook.add_format(RP_FORMAT),
+        "pct": workbook.add_format(PCT_FORMAT),
+        "rank": workbook.add_format(RANK_FORMAT),
+        "min": workbook.add_format(MIN_FORMAT),
+    }
+
+
+def prepare_sheets(selected_sheets, df_dict, width_sample=None):
+    # Serial: bagian mahal adalah serialisasi xlsxwriter (satu workbook, tidak
+    # bisa dibagi ke process lain); pickle payload ke pool justru lebih lambat
+    masks = sheet_masks(selected_sheets, df_dict)
+    return [
+        prepare_sheet(sheet, df_dict[sheet], width_sample, mask)
+        for sheet, mask in zip(selected_sheets, masks)
+    ]
+
+
+def generate_multi_sheet_excel(selected_sheets, df_dict, width_sample=None):
+    """
+    width_sample: kalau diisi, lebar kolom teks diperkirakan dari sampel
+    sebanyak itu (untuk sheet yang sangat panjang).
+    """
+    n_rows = sum(len(df_dict[sheet]) for sheet in selected_sheets)
+    with stage("export: prepare sheets", rows=n_rows):
+        payloads = prepare_sheets(selected_sheets, df_dict, width_sample)
+
+    # Di-import saat export diminta saja, bukan saat app start
+    import xlsxwriter
+
+    output = BytesIO()
+
+    with stage("export: write workbook", rows=n_rows):
+        workbook = xlsxwriter.Workbook(output)
+        formats = add_formats(workbook)
+
+        for payload in payloads:
+            write_sheet(workbook, formats, payload)
+
+        workbook.close()
+
+    output.seek(0)
+    return output.getvalue()
+
+
+def column_array(series):
+    # float64 / object biasanya view (tanpa copy); rank Int64 jadi float64
+    if is_number_column(series):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return series.to_numpy(dtype=object)
+
+
+def chunk_values(values, start, stop):
+    """Potongan [start, stop) sebagai object array; NaN / inf jadi None."""
+    part = values[start:stop]
+    if part.dtype == np.float64:
+        out = part.astype(object)
+        out[~np.isfinite(part)] = None
+        return out
+    out = part.copy()
+    out[pd.isna(out)] = None
+    return out
+
+
+def format_runs(kinds, formats):
+    """Kolom berurutan dengan format sama -> (c0, c1, format), satu write_row per run."""
+    runs = []
+    for c, kind in enumerate(kinds):
+        if runs and runs[-1][2] is formats.get(kind):
+            runs[-1][1] = c + 1
+        else:
+            runs.append([c, c + 1, formats.get(kind)])
+    return runs
+
+
+def stream_sheet(workbook, formats, sheet, df, min_mask=None, width_sample=None):
+    """
+    Tulis satu sheet baris demi baris (wajib untuk constant_memory): hanya
+    STREAM_CHUNK_ROWS baris yang diubah jadi object Python sekaligus, jadi
+    memori tidak bergantung panjang sheet.
+    """
+    worksheet = workbook.add_worksheet(sheet)
+    kinds = column_kinds(sheet, df)
+
+    # set_column harus sebelum baris ditulis di mode constant_memory
+    for i, width in enumerate(column_widths(df, kinds, width_sample)):
+        worksheet.set_column(i, i, width, formats.get(kinds[i]))
+    worksheet.write_row(0, 0, [str(c) for c in df.columns], formats["header"])
+
+    if sheet == RANK_DEV_SHEET and min_mask is None:
+        min_mask = row_min_mask(df)
+    if sheet != RANK_DEV_SHEET:
+        min_mask = None
+    elif min_mask is not None:
+        min_mask = min_mask & np.array([k is not None for k in kinds])
+
+    runs = format_runs(kinds, formats)
+    columns = [column_array(df[col]) for col in df.columns]
+    n_rows, n_cols = df.shape
+    for start in range(0, n_rows, STREAM_CHUNK_ROWS):
+        stop = min(start + STREAM_CHUNK_ROWS, n_rows)
+        block = np.empty((stop - start, n_cols), dtype=object)
+        for c, values in enumerate(columns):
+            block[:, c] = chunk_values(values, start, stop)
+
+        # sel termurah per baris, urut baris (np.nonzero row-major)
+        min_r, min_c = (np.nonzero(min_mask[start:stop]) if min_mask is not None else ((), ()))
+        k = 0
+        for i, row in enumerate(block.tolist()):
+            r = start + i + 1
+            for c0, c1, fmt in runs:
+                worksheet.write_row(r, c0, row[c0:c1], fmt)
+            while k < len(min_r) and min_r[k] == i:
+                value = row[min_c[k]]
+                if value is not None:
+                    worksheet.write_number(r, int(min_c[k]), value, formats["min"])
+                k += 1
+
+
+def export_excel_file(selected_sheets, df_dict, path, width_sample=None):
+    """
+    Versi constant-memory generate_multi_sheet_excel: workbook langsung
+    ditulis ke `path` (xlsxwriter constant_memory, baris berurutan dari array
+    hasil), tanpa list per kolom dan tanpa salinan BytesIO / getvalue().
+    Return path.
+    """
+    import xlsxwriter
+
+    n_rows = sum(len(df_dict[sheet]) for sheet in selected_sheets)
+    with stage("export: stream workbook", rows=n_rows):
+        workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+        formats = add_formats(workbook)
+        masks = sheet_masks(selected_sheets, df_dict)
+        for sheet, mask in zip(selected_sheets, masks):
+            stream_sheet(workbook, formats, sheet, df_dict[sheet], mask, width_sample)
+        workbook.close()
+    return path
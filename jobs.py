@@ -0,0 +1,83 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Worker dibagi semua session dalam satu process server
+EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pipeline")
+
+
+class JobCancelled(Exception):
+    """Dilempar di dalam pipeline saat job dibatalkan / digantikan upload baru."""
+
+
+class PipelineJob:
+    """
+    Satu run parse -> rank -> deviation di background thread.
+    Pipeline memanggil job.report(...) di tiap stage / chunk; report juga
+    titik cek pembatalan, jadi cancel() berlaku paling lambat di chunk berikutnya.
+    """
+
+    def __init__(self, key, target, *args):
+        self.key = key
+        self.target = target
+        self.args = args
+        self.stage = "Queued"
+        self.progress = 0.0
+        self.status = "running"  # running / done / failed / cancelled
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+
+    def report(self, stage, progress=None):
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.key)
+        self.stage = stage
+        if progress is not None:
+            self.progress = min(max(progress, 0.0), 1.0)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            self.result = self.target(self, *self.args)
+            self.status = "done"
+            self.progress = 1.0
+        except JobCancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            self.error = e
+            self.status = "failed"
+        finally:
+            self.done_event.set()
+
+    @property
+    def done(self):
+        return self.done_event.is_set()
+
+    def wait(self, timeout=None):
+        return self.done_event.wait(timeout)
+
+
+def submit_job(session_state, key, target, *args, slot="pipeline_job"):
+    """
+    Jalankan job untuk `key` di session ini. Job lama dengan key lain
+    dibatalkan (upload baru menggantikan, bukan antre di belakangnya);
+    job dengan key yang sama dipakai ulang.
+    """
+    job = session_state.get(slot)
+    if job is not None and job.key == key:
+        return job
+    if job is not None and not job.done:
+        job.cancel()
+
+    job = PipelineJob(key, target, *args)
+    session_state[slot] = job
+    EXECUTOR.submit(job.run)
+    return job
+
+
+def clear_job(session_state, slot="pipeline_job"):
+    job = session_state.pop(slot, None)
+    if job is not None and not job.done:
+        job.cancel()
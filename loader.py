@@ -0,0 +1,232 @@
+import zipfile
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from profiling import timed
+from validation import validate_table
+
+CHUNK_ROWS = 4096
+XLS_MAGIC = b"\xd0\xcf\x11\xe0"
+
+
+class TenderFormatError(ValueError):
+    """Layout sheet melanggar constraint di user guide (No / TOTAL / kosong)."""
+
+
+def is_empty(val):
+    return val is None or (isinstance(val, str) and not val.strip())
+
+
+NUMBER_TYPES = {int, float, type(None)}
+
+
+def cell_name(row, col):
+    # row & col 0-based -> "B2"
+    from openpyxl.utils import get_column_letter
+    return f"{get_column_letter(col + 1)}{row + 1}"
+
+
+def open_source(source):
+    """bytes / path / file object -> (is_xls, source yang siap dibaca)."""
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+
+    head = source.read(4) if hasattr(source, "read") else open(source, "rb").read(4)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return head == XLS_MAGIC, source
+
+
+def load_workbook(source):
+    # openpyxl baru di-import saat benar-benar parse (snapshot hit tidak butuh)
+    import openpyxl
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        return openpyxl.load_workbook(source, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError) as e:
+        raise TenderFormatError("The file is not a readable Excel workbook.") from e
+
+
+def read_xls(source, sheet=None):
+    """
+    .xls (format lama) lewat pandas + xlrd. sheet=None -> nama semua sheet,
+    selain itu DataFrame mentah (header=None) sheet tersebut.
+    Semua error baca jadi TenderFormatError supaya tampil sebagai pesan.
+    """
+    try:
+        book = pd.ExcelFile(source, engine="xlrd")
+    except ImportError as e:
+        raise TenderFormatError(
+            "Reading .xls files needs the xlrd package; save the file as .xlsx instead."
+        ) from e
+    except Exception as e:  # xlrd: XLRDError, CompDocError, ValueError, ...
+        raise TenderFormatError("The file is not a readable Excel workbook.") from e
+
+    with book:
+        names = book.sheet_names
+        if sheet is None:
+            return names
+        if sheet not in names and not (isinstance(sheet, int) and 0 <= sheet < len(names)):
+            raise TenderFormatError(f"Sheet {sheet!r} not found in the workbook.")
+        try:
+            return book.parse(sheet, header=None)
+        except Exception as e:
+            raise TenderFormatError("The file is not a readable Excel workbook.") from e
+
+
+def sheet_names(source):
+    """Nama semua sheet di workbook, sesuai urutan tab."""
+    is_xls, source = open_source(source)
+    if is_xls:
+        return read_xls(source)
+
+    wb = load_workbook(source)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def iter_sheet_rows(source, sheet=0):
+    """
+    Stream baris (tuple of values) dari satu sheet (index atau nama, default
+    sheet pertama). .xlsx dibaca lewat openpyxl read_only; .xls (format lama)
+    tidak bisa di-stream, jadi dibaca lewat pandas (butuh xlrd).
+    """
+    is_xls, source = open_source(source)
+
+    if is_xls:
+        df = read_xls(source, sheet)
+        for row in df.itertuples(index=False):
+            yield tuple(None if pd.isna(v) else v for v in row)
+        return
+
+    wb = load_workbook(source)
+    try:
+        ws = wb.worksheets[sheet] if isinstance(sheet, int) else wb[sheet]
+    except (IndexError, KeyError) as e:
+        wb.close()
+        raise TenderFormatError(f"Sheet {sheet!r} not found in the workbook.") from e
+
+    # dimension di header sheet sering salah / tidak ada; jangan scan dulu
+    ws.reset_dimensions()
+    try:
+        for row in ws.iter_rows(values_only=True):
+            yield row
+    finally:
+        wb.close()
+
+
+def flush_chunk(rows, columns, n_cols):
+    """Chunk baris -> satu array per kolom (float64 kalau semua angka)."""
+    block = np.empty((len(rows), n_cols), dtype=object)
+    block[:] = rows
+    for c in range(n_cols):
+        values = block[:, c]
+        if set(map(type, values)) <= NUMBER_TYPES:
+            # None -> NaN
+            values = values.astype(np.float64)
+        columns[c].append(values)
+
+
+@timed("read_tender", rows=len)
+def read_tender(source, on_chunk=None, sheet=0):
+    """
+    Baca floating table (tidak harus mulai dari A1) dari file upload.
+    Baris di-stream per chunk lalu langsung dijadikan array NumPy per kolom,
+    sehingga sheet besar tidak perlu dimuat utuh ke memori.
+    on_chunk(n_rows) dipanggil setiap satu chunk selesai (progress / cancel).
+    sheet: index atau nama sheet (default sheet pertama).
+    """
+    rows = iter_sheet_rows(source, sheet)
+
+    # ===== CARI ANCHOR (baris & kolom pertama yang tidak kosong) =====
+    header = None
+    for r, row in enumerate(rows):
+        filled = [c for c, v in enumerate(row) if not is_empty(v)]
+        if filled:
+            left, right = filled[0], filled[-1] + 1
+            header = [str(v).strip() if not is_empty(v) else "" for v in row[left:right]]
+            top = r
+            break
+
+    if header is None:
+        raise TenderFormatError("The sheet is empty.")
+
+    for c, name in enumerate(header):
+        if not name or header.index(name) != c:
+            raise TenderFormatError(
+                f"Cell {cell_name(top, left + c)}: column headers must be filled and unique."
+            )
+        if name.upper() in ("NO", "NO."):
+            raise TenderFormatError(
+                f'Cell {cell_name(top, left + c)}: a "No" column is not allowed.'
+            )
+        if name.upper() == "TOTAL":
+            raise TenderFormatError(
+                f"Cell {cell_name(top, left + c)}: a TOTAL column is not allowed."
+            )
+
+    # ===== STREAM DATA PER CHUNK =====
+    n_cols = len(header)
+    columns = [[] for _ in range(n_cols)]
+    chunk = []
+    n_rows = 0
+    gap = None  # baris kosong pertama = akhir tabel
+
+    for r, row in enumerate(rows, start=top + 1):
+        values = tuple(row[left:right]) + (None,) * max(0, right - len(row))
+        filled = [c for c, v in enumerate(values) if not is_empty(v)]
+        if not filled:
+            if gap is None:
+                gap = r
+            continue
+        if gap is not None:
+            # masih ada data di bawah baris kosong: jangan dibuang diam-diam
+            raise TenderFormatError(
+                f"Cell {cell_name(r, left + filled[0])}: data continues below the empty row "
+                f"{gap + 1}; the table must not contain empty rows."
+            )
+
+        for c, v in enumerate(values):
+            if isinstance(v, str) and v.strip().upper() == "TOTAL":
+                raise TenderFormatError(
+                    f"Cell {cell_name(r, left + c)}: a TOTAL row is not allowed."
+                )
+
+        chunk.append(tuple(None if is_empty(v) else v for v in values))
+        n_rows += 1
+        if len(chunk) == CHUNK_ROWS:
+            flush_chunk(chunk, columns, n_cols)
+            chunk = []
+            if on_chunk is not None:
+                on_chunk(n_rows)
+
+    if chunk:
+        flush_chunk(chunk, columns, n_cols)
+
+    if n_rows == 0:
+        raise TenderFormatError(f"The table at {cell_name(top, left)} has no data rows.")
+
+    # ===== GABUNG CHUNK =====
+    data = {}
+    for name, parts in zip(header, columns):
+        if all(part.dtype == np.float64 for part in parts):
+            data[name] = np.concatenate(parts)
+        else:
+            data[name] = np.concatenate([part.astype(object) for part in parts])
+
+    df = pd.DataFrame(data)
+
+    # ===== CEK STRUKTUR (column order, kolom 1..N, TOTAL hasil penjumlahan) =====
+    issues = validate_table(df, top, left)
+    if issues:
+        first = issues[0]
+        more = f" ({len(issues) - 1} more issue(s) found.)" if len(issues) > 1 else ""
+        raise TenderFormatError(f"Cell {cell_name(first.row, first.col)}: {first.message}{more}")
+
+    df.attrs["anchor"] = cell_name(top, left)
+    return df
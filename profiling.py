@@ -0,0 +1,159 @@
+"""
+Timing ringan per stage (wall time, rows, peak memory).
+
+Aktif hanya kalau env STDDEV_PROFILE=1 (STDDEV_PROFILE=memory untuk ikut
+mengukur peak memory lewat tracemalloc). Saat nonaktif, stage() dan @timed
+hanya menambah satu pengecekan boolean.
+
+Setiap record juga dikirim ke logger "standard_deviation.timing" (level
+INFO) sebagai satu baris JSON supaya bisa di-scrape. Saat profiling aktif,
+logger itu diberi handler ke stderr kalau belum ada handler sama sekali
+(termasuk di root logger); kalau aplikasi sudah mengatur logging sendiri,
+record ikut handler yang ada.
+
+peak_memory_bytes: tracemalloc hanya punya satu peak untuk seluruh process,
+jadi peak hanya dicatat di stage terluar. Stage di dalamnya (mis.
+rank_tables di dalam update_rank_tables) dan stage yang selesai ketika stage
+lain (session lain) masih jalan dicatat None; peak stage terakhir yang
+selesai mencakup semua stage yang berjalan bersamaan.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+logger = logging.getLogger("standard_deviation.timing")
+
+MAX_RECORDS = 500
+
+ENABLED = os.environ.get("STDDEV_PROFILE", "").lower() in ("1", "true", "memory")
+TRACE_MEMORY = os.environ.get("STDDEV_PROFILE", "").lower() == "memory"
+
+RECORDS = deque(maxlen=MAX_RECORDS)
+LOCK = threading.Lock()
+# stage yang sedang mengukur memory (semua thread), lihat docstring modul
+MEMORY_DEPTH = 0
+
+
+def configure_logging():
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+    if not logger.hasHandlers():
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+
+
+def enable(memory=False):
+    global ENABLED, TRACE_MEMORY
+    ENABLED = True
+    TRACE_MEMORY = memory
+    configure_logging()
+
+
+def disable():
+    global ENABLED, TRACE_MEMORY
+    ENABLED = False
+    TRACE_MEMORY = False
+
+
+if ENABLED:
+    configure_logging()
+
+
+def records():
+    with LOCK:
+        return list(RECORDS)
+
+
+def clear():
+    with LOCK:
+        RECORDS.clear()
+
+
+class NullStage:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_STAGE = NullStage()
+
+
+class Stage:
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        global MEMORY_DEPTH
+        self.trace_memory = TRACE_MEMORY
+        if self.trace_memory:
+            with LOCK:
+                if MEMORY_DEPTH == 0:
+                    if not tracemalloc.is_tracing():
+                        tracemalloc.start()
+                    tracemalloc.reset_peak()
+                MEMORY_DEPTH += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global MEMORY_DEPTH
+        seconds = time.perf_counter() - self.start
+        peak = None
+        if self.trace_memory:
+            with LOCK:
+                MEMORY_DEPTH -= 1
+                if MEMORY_DEPTH == 0:
+                    peak = tracemalloc.get_traced_memory()[1]
+        record = {
+            "stage": self.name,
+            "seconds": round(seconds, 6),
+            "rows": self.rows,
+            "peak_memory_bytes": peak,
+            "thread": threading.current_thread().name,
+            "ok": exc_type is None,
+            "timestamp": time.time(),
+        }
+        with LOCK:
+            RECORDS.append(record)
+        logger.info(json.dumps(record))
+        return False
+
+
+def stage(name, rows=None):
+    """
+    with stage("read dummy dataset") as s:
+        ...
+        s.rows = n   # opsional, kalau jumlah baris baru diketahui di akhir
+    """
+    if not ENABLED:
+        return NULL_STAGE
+    return Stage(name, rows)
+
+
+def timed(name=None, rows=None):
+    """Decorator; `rows(result)` opsional untuk mencatat jumlah baris hasil."""
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with Stage(label) as s:
+                result = fn(*args, **kwargs)
+                if rows is not None:
+                    s.rows = rows(result)
+            return result
+        return wrapper
+    return decorator
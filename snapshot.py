@@ -0,0 +1,141 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tender import TenderTable
+
+# Naikkan setiap kali isi snapshot atau cek yang dijalankan sebelum snapshot
+# ditulis berubah (v2: validasi struktur), supaya snapshot lama tidak dipakai
+# v3: kategori label per kolom (tipe asli, bukan string)
+# v4: toleransi TOTAL relatif terhadap jumlahnya
+SNAPSHOT_VERSION = 4
+# Total ukuran snapshot di disk; yang paling lama tidak dibuka dihapus duluan
+SNAPSHOT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+CACHE_DIR = Path(
+    os.environ.get("STDDEV_CACHE_DIR", Path.home() / ".cache" / "standard-deviation")
+)
+
+
+def snapshot_dir(file_key, cache_dir=None):
+    return Path(cache_dir or CACHE_DIR) / file_key
+
+
+def read_meta(path):
+    try:
+        return json.loads((path / "meta.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def save_snapshot(file_key, table, cache_dir=None):
+    """
+    Simpan TenderTable ke disk dalam format kolumnar:
+      prices.npy       matriks harga (n_rows x n_vendors)
+      codes.npy        kode int32 per sel kolom Scope/Desc (-1 = kosong)
+      categories.pkl   kategori per kolom label (nilai unik, tipe asli)
+      meta.json        nama kolom, anchor, versi
+    Ditulis ke folder sementara lalu di-rename supaya pembaca tidak pernah
+    melihat snapshot setengah jadi. Setelah itu snapshot lama dipangkas
+    sampai total <= SNAPSHOT_MAX_BYTES.
+    """
+    target = snapshot_dir(file_key, cache_dir)
+    if target.exists():
+        meta = read_meta(target)
+        if meta is not None and meta.get("version") == SNAPSHOT_VERSION:
+            return target
+        # snapshot versi lama / rusak: ganti dengan yang baru
+        shutil.rmtree(target, ignore_errors=True)
+
+    codes = np.empty(table.labels.shape, dtype=np.int32)
+    categories = []
+    for i, col in enumerate(table.labels.columns):
+        codes[:, i] = table.labels[col].cat.codes.to_numpy()
+        categories.append(table.labels[col].cat.categories)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=target.parent, prefix=f".{file_key}-"))
+    try:
+        np.save(tmp / "prices.npy", np.ascontiguousarray(table.prices))
+        np.save(tmp / "codes.npy", codes)
+        with open(tmp / "categories.pkl", "wb") as f:
+            pickle.dump(categories, f, protocol=pickle.HIGHEST_PROTOCOL)
+        (tmp / "meta.json").write_text(json.dumps({
+            "version": SNAPSHOT_VERSION,
+            "key_columns": [str(c) for c in table.labels.columns],
+            "vendor_columns": [str(c) for c in table.vendors],
+            "anchor": table.labels.attrs.get("anchor"),
+        }))
+        os.rename(tmp, target)
+    except FileExistsError:
+        # session lain sudah menulis snapshot yang sama duluan
+        shutil.rmtree(tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    trim_snapshots(cache_dir)
+    return target
+
+
+def open_snapshot(file_key, cache_dir=None):
+    """
+    Buka snapshot sebagai TenderTable tanpa copy: prices berupa memmap
+    read-only, label langsung jadi categorical dari kode + kategori per kolom.
+    Return None kalau snapshot belum ada / versinya beda.
+    """
+    path = snapshot_dir(file_key, cache_dir)
+    meta = read_meta(path)
+    if meta is None or meta.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    prices = np.load(path / "prices.npy", mmap_mode="r")
+    codes = np.load(path / "codes.npy", mmap_mode="r")
+    try:
+        with open(path / "categories.pkl", "rb") as f:
+            categories = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    os.utime(path / "meta.json")  # LRU untuk trim_snapshots pakai mtime
+
+    labels = pd.DataFrame({
+        name: pd.Categorical.from_codes(codes[:, i], categories=categories[i])
+        for i, name in enumerate(meta["key_columns"])
+    })
+    labels.attrs["anchor"] = meta.get("anchor")
+    return TenderTable(
+        labels=labels,
+        vendors=pd.CategoricalIndex(meta["vendor_columns"]),
+        prices=prices,
+    )
+
+
+def trim_snapshots(cache_dir=None, max_bytes=SNAPSHOT_MAX_BYTES):
+    """
+    Hapus snapshot yang paling lama tidak dibuka (mtime meta.json) sampai
+    total ukuran <= max_bytes. Folder lain di cache dir (store, exports)
+    tidak disentuh.
+    """
+    root = Path(cache_dir or CACHE_DIR)
+    snapshots = []
+    try:
+        for entry in os.scandir(root):
+            meta = Path(entry.path) / "meta.json"
+            if entry.name.startswith(".") or not meta.is_file():
+                continue
+            size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+            snapshots.append((meta.stat().st_mtime, size, entry.path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in snapshots)
+    for _, size, path in sorted(snapshots):
+        if total <= max_bytes:
+            break
+        # memmap yang masih terbuka tetap valid (POSIX); di Windows bisa gagal
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
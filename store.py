@@ -0,0 +1,244 @@
+"""
+Store hasil yang dibagi semua session dalam satu process server.
+
+Sepuluh analis yang membuka tender yang sama memakai satu salinan tabel,
+hasil ranking dan workbook Excel (key = content hash upload). Setiap session
+"memegang" key yang sedang ditampilkan (lease, diperbarui tiap rerun);
+entry yang masih dipegang session lain baru dibuang paling akhir. Session
+yang pergi tidak melepas lease-nya; lease itu dibuang setelah expired (saat
+pin / evict berikutnya). Entry yang
+keluar dari memori bisa disimpan ke disk (opsional) supaya tidak perlu
+dihitung ulang.
+
+Nilai di store dipakai bersama: perlakukan sebagai read-only. Saat masuk
+store, semua array di baliknya dikunci writeable=False: array NumPy, harga &
+label TenderTable, dan kolom DataFrame angka, Int64/masked dan categorical
+(semua kolom tabel hasil; teks disimpan sebagai categorical). Menulis sel
+(iloc/loc/to_numpy) jadi ValueError. Yang tidak terkunci:
+  - kolom object (teks bebas): fungsi Cython pandas (memory_usage, dll.)
+    butuh buffer object yang writeable
+  - menambah / mengganti kolom (df[col] = ...): object DataFrame-nya sendiri
+    dipakai bersama, jadi lakukan di salinan (df.copy())
+"""
+import os
+import pickle
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cache import DEFAULT_MAX_BYTES, ResultCache, content_hash
+
+# Session yang tidak rerun selama ini dianggap sudah pergi
+LEASE_SECONDS = 15 * 60
+DEFAULT_DISK_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Naikkan kalau bentuk nilai yang disimpan berubah (mis. jumlah rank tables),
+# supaya file lama di disk tier tidak terbaca sebagai format baru
+STORE_VERSION = 3
+
+
+def read_only(values):
+    """View read-only dari array (tanpa copy)."""
+    view = values.view()
+    view.setflags(write=False)
+    return view
+
+
+def freeze_column(values):
+    """values = Series.array -> array yang sama, di atas view read-only."""
+    if isinstance(values, pd.Categorical):
+        # .codes sudah view read-only dari kode internal
+        return pd.Categorical.from_codes(values.codes, dtype=values.dtype, validate=False)
+    if isinstance(values, pd.arrays.NumpyExtensionArray):
+        if values.dtype == object:
+            return values  # lihat docstring modul
+        return read_only(values.to_numpy())
+    if isinstance(values, pd.api.extensions.ExtensionArray) and hasattr(values, "_mask"):
+        # IntegerArray / FloatingArray / BooleanArray: (data, mask) seperti di constructor
+        return type(values)(read_only(values._data), read_only(values._mask))
+    return values
+
+
+def freeze_frame(df):
+    # Mengunci blok DataFrame yang ada tidak cukup (pandas menulis lewat view
+    # bloknya sendiri), jadi DataFrame dibangun ulang di atas view read-only
+    out = pd.DataFrame(
+        {col: freeze_column(df.iloc[:, i].array) for i, col in enumerate(df.columns)},
+        index=df.index,
+        copy=False,
+    )
+    out.attrs = dict(df.attrs)
+    return out
+
+
+def freeze(value):
+    """
+    Versi read-only dari value (tanpa copy data): array NumPy dikunci in-place,
+    DataFrame dibangun ulang di atas view read-only. Simpan hasil return-nya.
+    """
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, pd.DataFrame):
+        value = freeze_frame(value)
+    elif hasattr(value, "prices"):
+        freeze(value.prices)  # TenderTable
+        value.labels = freeze(value.labels)
+    elif isinstance(value, tuple):
+        value = tuple(freeze(v) for v in value)
+    elif isinstance(value, list):
+        value = [freeze(v) for v in value]
+    return value
+
+
+class SharedStore(ResultCache):
+    """
+    ResultCache + lease per session + disk tier opsional.
+
+    Urutan eviction saat lewat max_bytes: entry yang tidak dipegang session
+    mana pun (LRU), baru kemudian yang masih dipegang. Entry yang dibuang
+    ditulis ke disk_dir kalau diisi, dan dibaca lagi dari sana saat get().
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk_dir=None,
+                 disk_max_bytes=DEFAULT_DISK_MAX_BYTES, lease_seconds=LEASE_SECONDS):
+        super().__init__(max_bytes)
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self.disk_max_bytes = disk_max_bytes
+        self.lease_seconds = lease_seconds
+        self.leases = {}  # owner -> (expiry, frozenset keys)
+        self.spilled = []  # (key, value) yang dibuang, ditulis ke disk di luar lock
+        self.disk_lock = threading.Lock()
+
+    # ===== LEASE PER SESSION =====
+
+    def pin(self, owner, keys):
+        """
+        Session `owner` sedang memakai `keys` (menggantikan lease sebelumnya,
+        mis. session sudah pindah ke file lain).
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.prune_leases(now)
+            self.leases[owner] = (now + self.lease_seconds, frozenset(keys))
+
+    def prune_leases(self, now):
+        # dipanggil dengan lock dipegang; session yang sudah pergi tidak
+        # pernah melepas lease-nya sendiri, jadi dibuang setelah expired
+        for owner in [o for o, (expiry, _) in self.leases.items() if expiry <= now]:
+            del self.leases[owner]
+
+    def pinned_keys(self, now):
+        # dipanggil dengan lock dipegang
+        self.prune_leases(now)
+        return set().union(*(keys for _, keys in self.leases.values()))
+
+    # ===== MEMORI =====
+
+    def put(self, key, value):
+        value = super().put(key, freeze(value))
+        if self.disk_dir is not None and key not in self.entries:
+            # lebih besar dari max_bytes: tidak masuk memori, langsung ke disk
+            with self.lock:
+                self.spilled.append((key, value))
+        self.flush_spilled()
+        return value
+
+    def evict(self):
+        # dipanggil dengan lock dipegang
+        pinned = self.pinned_keys(time.monotonic())
+        for only_unpinned in (True, False):
+            for key in list(self.entries):
+                if self.total_bytes <= self.max_bytes:
+                    return
+                if only_unpinned and key in pinned:
+                    continue
+                value, size = self.entries.pop(key)
+                self.total_bytes -= size
+                if self.disk_dir is not None:
+                    self.spilled.append((key, value))
+
+    def get(self, key, default=None):
+        missing = object()
+        value = super().get(key, missing)
+        if value is not missing:
+            return value
+        if self.disk_dir is None:
+            return default
+
+        value = self.load(key, missing)
+        if value is missing:
+            return default
+        # naik lagi ke memori (mungkin mendorong entry lain ke disk)
+        return self.put(key, value)
+
+    def stats(self):
+        with self.lock:
+            pinned = self.pinned_keys(time.monotonic())
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "pinned": sum(key in pinned for key in self.entries),
+                "sessions": len(self.leases),
+            }
+
+    # ===== DISK TIER =====
+
+    def disk_path(self, key):
+        return self.disk_dir / f"{content_hash(repr((STORE_VERSION, key)).encode())}.pkl"
+
+    def flush_spilled(self):
+        # pickle bisa lama, jadi tidak di dalam self.lock
+        with self.lock:
+            spilled, self.spilled = self.spilled, []
+        for key, value in spilled:
+            self.dump(key, value)
+        if spilled:
+            self.trim_disk()
+
+    def dump(self, key, value):
+        path = self.disk_path(key)
+        if path.exists():
+            return
+        tmp = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception:
+            # disk tier opsional: gagal tulis / pickle = cukup hitung ulang nanti
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def load(self, key, default=None):
+        path = self.disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return default
+        if stored_key != key:
+            return default
+        os.utime(path)  # LRU di disk pakai mtime
+        return value
+
+    def trim_disk(self):
+        with self.disk_lock:
+            try:
+                files = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                         for e in os.scandir(self.disk_dir) if e.name.endswith(".pkl")]
+            except OSError:
+                return
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.disk_max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
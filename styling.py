@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+from deviation import row_min_mask
+from profiling import timed
+
+MIN_STYLE = "background-color: #C6EFCE; color: #006100;"
+
+# Di atas batas ini x * 100 tidak lagi exact di float64, jadi serahkan ke format_rupiah
+FAST_FORMAT_LIMIT = 1e13
+
+
+def format_rupiah(x):
+    if pd.isna(x):
+        return ""
+    # pastikan bisa diubah ke float
+    try:
+        x = float(x)
+    except:
+        return x  # biarin apa adanya kalau bukan angka
+
+    # kalau tidak punya desimal (misal 7000.0), tampilkan tanpa ,00
+    if x.is_integer():
+        formatted = f"{int(x):,}".replace(",", ".")
+    else:
+        formatted = f"{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        # hapus ,00 kalau desimalnya 0 semua (misal 7000,00 → 7000)
+        if formatted.endswith(",00"):
+            formatted = formatted[:-3]
+    return formatted
+
+
+def format_rupiah_percent(x):
+    if pd.isna(x):
+        return ""                   # hilangkan None / NaN
+    return f"{format_rupiah(x)}%"   # pakai format_rupiah + %
+
+
+POW10 = 10 ** np.arange(19, dtype=np.int64)
+DIGITS = np.frombuffer(b"0123456789", dtype=np.uint8)
+CHUNK_ROWS = 65536
+
+
+def render_cents(cents, negative, suffix=""):
+    """
+    Render magnitudo dalam sen (int64 >= 0) jadi string "1.234.567,89" lewat
+    satu matriks byte (n x lebar maks), tanpa loop per sel.
+    """
+    n = len(cents)
+    int_part = cents // 100
+    dec = cents % 100
+    has_dec = dec > 0
+
+    n_digits = 1 + np.searchsorted(POW10[1:], int_part, side="right")
+    int_width = int(n_digits.max())
+    int_cols = int_width + (int_width - 1) // 3
+
+    # Layout rata kanan: [tanda] [integer + "."] ["," d d] [suffix] [NUL]
+    width = 1 + int_cols + 3 + len(suffix) + 1
+    chars = np.zeros((n, width), dtype=np.uint8)
+
+    rest = int_part
+    for p in range(int_cols):
+        col = int_cols - p
+        if p % 4 == 3:
+            chars[:, col] = ord(".")
+        else:
+            chars[:, col] = DIGITS[rest % 10]
+            rest = rest // 10
+
+    tail = int_cols + 1
+    chars[:, tail] = np.where(has_dec, ord(","), 0)
+    chars[:, tail + 1] = np.where(has_dec, DIGITS[dec // 10], 0)
+    chars[:, tail + 2] = np.where(has_dec, DIGITS[dec % 10], 0)
+    if suffix:
+        chars[:, tail + 3] = ord(suffix)
+
+        # tanpa desimal, suffix langsung nempel ke angka
+        no_dec = ~has_dec
+        chars[no_dec, tail] = ord(suffix)
+        chars[no_dec, tail + 3] = 0
+
+    int_len = n_digits + (n_digits - 1) // 3
+    start = int_cols + 1 - int_len - negative
+    chars[np.flatnonzero(negative), start[negative]] = ord("-")
+
+    # Geser tiap baris ke kiri; sisa kolom jatuh ke NUL di ujung
+    idx = np.minimum(start[:, None] + np.arange(width), width - 1)
+    chars = np.take_along_axis(chars, idx, axis=1)
+
+    # Tandai akhir tiap string, buang NUL, lalu decode sekali untuk semua baris
+    length = int_len + negative + 3 * has_dec + len(suffix)
+    chars[np.arange(n), length] = ord("\n")
+    blob = chars.tobytes().replace(b"\x00", b"").decode("ascii")
+    return blob.split("\n")[:-1]
+
+
+def format_rupiah_array(values, percent=False):
+    """
+    Versi batch dari format_rupiah / format_rupiah_percent untuk satu kolom
+    numeric. Hasilnya sama persis dengan memanggil fungsi per sel.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    out = np.full(x.shape, "", dtype=object)
+    suffix = "%" if percent else ""
+
+    finite = np.isfinite(x)
+    ax = np.abs(np.where(finite, x, 0.0))
+    scaled = ax * 100
+    frac = scaled - np.floor(scaled)
+
+    # Kasus .xx5 yang mepet dibulatkan oleh Python (exact), bukan oleh rint
+    near_half = np.abs(frac - 0.5) <= 4 * np.spacing(scaled)
+    fast = finite & (ax < FAST_FORMAT_LIMIT) & ~near_half
+
+    idx = np.flatnonzero(fast.ravel())
+    for start in range(0, len(idx), CHUNK_ROWS):
+        chunk = idx[start:start + CHUNK_ROWS]
+        xf = x.flat[chunk]
+        is_int = xf == np.trunc(xf)
+        cents = np.where(is_int, ax.flat[chunk] * 100, np.rint(scaled.flat[chunk]))
+        cents = cents.astype(np.int64)
+
+        # -0.001 tetap jadi "-0" seperti format_rupiah
+        negative = (xf < 0) & ((cents > 0) | ~is_int)
+        out.flat[chunk] = render_cents(cents, negative, suffix)
+
+    slow = ~fast & ~np.isnan(x)
+    for i in np.flatnonzero(slow.ravel()).tolist():
+        out.flat[i] = format_rupiah(x.flat[i]) + suffix
+
+    return out
+
+
+@timed("rupiah_formatters", rows=len)
+def rupiah_formatters(df, rupiah_cols=(), percent_cols=()):
+    """
+    Formatter per kolom untuk Styler.format. String dirender sekaligus lewat
+    format_rupiah_array, formatter-nya cuma lookup per nilai. Data di
+    bawahnya tetap angka, jadi klik header di st.dataframe tetap sort angka.
+    """
+    formatters = {}
+    for cols, percent in ((rupiah_cols, False), (percent_cols, True)):
+        for col in cols:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            text = dict(zip(values.tolist(), format_rupiah_array(values, percent).tolist()))
+            # NaN tidak pernah ketemu di dict (NaN != NaN) -> "" seperti format_rupiah
+            formatters[col] = lambda x, text=text: text.get(x, "")
+    return formatters
+
+
+def red_highlight(row):
+    styles = [""] * len(row)
+
+    # Highlight ROW "TOTAL"
+    if row["Scope"] == "TOTAL":
+        styles = ["color: #FF4D4D;" for _ in row]
+    else:
+        # Highlight COLUMN "TOTAL"
+        total_col_index = row.index.get_loc("TOTAL")
+        styles[total_col_index] = "color: #FF4D4D;"
+
+    return styles
+
+
+@timed("highlight_min_cells", rows=len)
+def highlight_min_cells(df, values=None, mask=None):
+    """
+    Styler.apply(axis=None): warnai sel termurah di setiap baris sekaligus.
+    `values` dipakai kalau df berisi string, bukan angka.
+    `mask` (mis. dari best_rank_mask) dipakai apa adanya kalau diberikan,
+    supaya highlight sama persis dengan hasil ranking & export Excel.
+    """
+    if mask is None:
+        mask = row_min_mask(df if values is None else values)
+    css = np.where(mask, MIN_STYLE, "")
+    return pd.DataFrame(css, index=df.index, columns=df.columns)
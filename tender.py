@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from deviation import (
+    changed_rows,
+    rank_tables_from_arrays,
+    split_columns,
+    update_rank_tables,
+)
+
+# Kalau lebih dari ini yang berubah, hitung ulang semua saja
+INCREMENTAL_MAX_FRACTION = 0.5
+
+
+@dataclass
+class TenderTable:
+    """
+    Representasi ringkas satu tender:
+      labels   kolom Scope/Desc sebagai categorical (string disimpan sekali)
+      vendors  nama vendor sebagai CategoricalIndex
+      prices   satu array 2-D C-contiguous (n_rows x n_vendors), float64/float32
+    """
+
+    labels: pd.DataFrame
+    vendors: pd.CategoricalIndex
+    prices: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df, dtype=np.float64):
+        """dtype=np.float32 memotong memori harga jadi separuh (presisi ~7 digit)."""
+        df_key, df_price = split_columns(df)
+        table = cls.from_parts(df_key, df_price.columns, df_price.to_numpy(dtype=dtype))
+        table.labels.attrs["anchor"] = df.attrs.get("anchor")
+        return table
+
+    @classmethod
+    def from_parts(cls, df_key, vendor_names, prices):
+        """Dari kolom Scope/Desc + matriks harga yang sudah jadi (mis. hasil consolidate)."""
+        labels = pd.DataFrame(
+            {col: pd.Categorical(df_key[col]) for col in df_key.columns},
+            index=pd.RangeIndex(len(df_key)),
+        )
+        labels.attrs["anchor"] = None
+        return cls(
+            labels=labels,
+            vendors=pd.CategoricalIndex(vendor_names),
+            prices=np.ascontiguousarray(prices),
+        )
+
+    @property
+    def n_rows(self):
+        return self.prices.shape[0]
+
+    @property
+    def n_vendors(self):
+        return self.prices.shape[1]
+
+    def downcast(self):
+        """Copy dengan harga float32."""
+        return TenderTable(self.labels, self.vendors, self.prices.astype(np.float32))
+
+    def memory_usage(self):
+        return (
+            int(self.labels.memory_usage(index=False, deep=True).sum())
+            + int(self.vendors.memory_usage(deep=True))
+            + self.prices.nbytes
+        )
+
+    def rank_tables(self, method="min"):
+        """(df_bid_rank, df_rank_dev, df_sum_dev, df_stats, df_outliers) langsung dari matriks harga."""
+        return rank_tables_from_arrays(self.labels, list(self.vendors), self.prices, method)
+
+    def changed_rows(self, previous):
+        """
+        Baris yang berbeda dari upload sebelumnya, atau None kalau struktur
+        tabelnya sendiri berubah (jumlah baris, vendor, Scope/Desc).
+        """
+        if (
+            previous.prices.shape != self.prices.shape
+            or list(previous.vendors) != list(self.vendors)
+            or not previous.labels.astype(object).equals(self.labels.astype(object))
+        ):
+            return None
+        return changed_rows(
+            np.asarray(previous.prices, dtype=np.float64),
+            np.asarray(self.prices, dtype=np.float64),
+        )
+
+    def update_rank_tables(self, previous, previous_tables, method="min"):
+        """
+        Rank tables untuk tabel ini dengan memakai ulang hasil `previous`:
+        hanya baris yang harganya berubah yang di-argsort ulang.
+        `previous_tables` harus dihitung dengan `method` yang sama.
+        """
+        rows = self.changed_rows(previous)
+        if rows is None or len(rows) > INCREMENTAL_MAX_FRACTION * self.n_rows:
+            return self.rank_tables(method)
+        return update_rank_tables(
+            previous_tables, self.labels, list(self.vendors), self.prices, rows, method
+        )
+
+    def to_frame(self):
+        """DataFrame "Scope/Desc + Vendor A..N" seperti hasil loader."""
+        df = pd.concat(
+            [self.labels, pd.DataFrame(self.prices, columns=list(self.vendors))],
+            axis=1,
+        )
+        df.attrs["anchor"] = self.labels.attrs.get("anchor")
+        return df
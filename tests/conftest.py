@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modul app ada di root repo (tanpa package), jadi root dimasukkan ke sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
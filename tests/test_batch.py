@@ -0,0 +1,62 @@
+import csv
+
+import openpyxl
+
+from batch import main
+
+
+def save_workbook(path, rows, sheet="Sheet1"):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = sheet
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def read_summary(output_dir):
+    with open(output_dir / "summary.csv", newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+GOOD = [["Scope", "A", "B"], ["WP1", 100, 120], ["WP2", 150, 140], ["WP3", 90, 95]]
+
+
+def test_batch_writes_results_and_summary(tmp_path, capsys):
+    save_workbook(tmp_path / "good.xlsx", GOOD)
+    save_workbook(tmp_path / "bad.xlsx", [["Scope", "A", "TOTAL"], ["WP1", 100, 100]])
+    (tmp_path / "~$good.xlsx").write_bytes(b"lock file")  # diabaikan
+    out = tmp_path / "out"
+
+    assert main([str(tmp_path), "-o", str(out), "-j", "1"]) == 1
+
+    rows = read_summary(out)
+    assert [r["file"] for r in rows] == ["bad.xlsx", "good.xlsx"]
+    bad, good = rows
+    assert bad["status"] == "error" and "TOTAL column" in bad["error"] and not bad["output"]
+    assert (good["status"], good["rows"], good["vendors"], good["error"]) == ("ok", "3", "2", "")
+    assert (out / good["output"]).is_file()
+    assert "1/2 tenders processed" in capsys.readouterr().out
+
+
+def test_batch_exit_code_is_zero_when_all_succeed(tmp_path):
+    save_workbook(tmp_path / "good.xlsx", GOOD)
+    assert main([str(tmp_path), "-j", "1"]) == 0
+    assert read_summary(tmp_path / "output")[0]["status"] == "ok"
+
+
+def test_combine_writes_one_consolidated_result(tmp_path):
+    save_workbook(tmp_path / "a.xlsx", [["Scope", "A"], ["WP1", 100], ["WP2", 150], ["WP3", 90]])
+    save_workbook(tmp_path / "b.xlsx", [["Scope", "B"], ["WP1", 120], ["WP2", 140], ["WP4", 70]])
+    out = tmp_path / "out"
+
+    assert main([str(tmp_path), "-o", str(out), "--combine"]) == 0
+
+    [row] = read_summary(out)
+    assert (row["file"], row["status"], row["rows"], row["vendors"]) == ("2 workbooks", "ok", "4", "2")
+    assert (out / "Consolidated - Standard Deviation.xlsx").is_file()
+
+    (tmp_path / "c.xlsx").write_bytes(b"not a workbook")
+    assert main([str(tmp_path), "-o", str(out), "--combine"]) == 1
+    [row] = read_summary(out)
+    assert row["status"] == "error" and "c.xlsx: The file is not a readable" in row["error"]
@@ -0,0 +1,63 @@
+import numpy as np
+
+from cache import ResultCache, content_hash, sizeof
+
+
+def test_lru_entries_are_evicted_first():
+    cache = ResultCache(max_bytes=300)
+    cache.put("a", b"x" * 100)
+    cache.put("b", b"x" * 100)
+    cache.put("c", b"x" * 100)
+    assert cache.get("a") is not None  # "a" jadi paling baru dipakai
+
+    cache.put("d", b"x" * 100)
+    assert cache.get("b") is None
+    assert [key for key in cache.entries] == ["c", "a", "d"]
+    assert cache.total_bytes == 300
+
+
+def test_size_cap_counts_bytes_not_items():
+    cache = ResultCache(max_bytes=1000)
+    for i in range(10):
+        cache.put(i, np.zeros(40))  # 320 bytes
+    assert list(cache.entries) == [7, 8, 9]
+    assert cache.total_bytes == 960 <= cache.max_bytes
+
+
+def test_value_larger_than_cap_is_returned_but_not_stored():
+    cache = ResultCache(max_bytes=100)
+    cache.put("small", b"x" * 50)
+    big = b"x" * 101
+    assert cache.put("big", big) is big
+    assert cache.get("big") is None
+    # yang sudah ada tidak ikut terbuang
+    assert cache.get("small") == b"x" * 50 and cache.total_bytes == 50
+
+
+def test_put_replaces_existing_key_size():
+    cache = ResultCache(max_bytes=1000)
+    cache.put("a", b"x" * 400)
+    cache.put("a", b"x" * 100)
+    assert cache.total_bytes == 100
+    # versi baru lebih besar dari cap: versi lama juga dibuang
+    cache.put("a", b"x" * 2000)
+    assert cache.get("a") is None and cache.total_bytes == 0
+
+
+def test_get_or_compute_computes_once():
+    cache = ResultCache()
+    calls = []
+    compute = lambda: calls.append(1) or "value"
+    assert cache.get_or_compute("k", compute) == "value"
+    assert cache.get_or_compute("k", compute) == "value"
+    assert len(calls) == 1
+
+
+def test_sizeof_and_clear():
+    assert sizeof((b"ab", np.zeros(2), {"k": b"abc"})) == 2 + 16 + 3
+    assert content_hash(b"a") == content_hash(b"a") != content_hash(b"b")
+
+    cache = ResultCache()
+    cache.put("a", b"x" * 10)
+    cache.clear()
+    assert cache.get("a") is None and cache.total_bytes == 0
@@ -0,0 +1,110 @@
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pytest
+
+from consolidate import consolidate_tenders
+from loader import TenderFormatError
+
+
+def workbook(**sheets):
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    out = BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def prices_by_scope(tender):
+    return {
+        scope: dict(zip(tender.vendors, row))
+        for scope, row in zip(tender.labels["Scope"], tender.prices.tolist())
+    }
+
+
+def test_joins_vendor_workbooks_by_scope():
+    vendor_a = workbook(Prices=[["Scope", "A"], ["WP1", 100], ["WP2", 200], ["WP3", 330]])
+    vendor_b = workbook(Sheet1=[["Scope", "B"], ["WP2", 210], ["WP3", 290], ["WP4", 50]])
+
+    tender = consolidate_tenders([("a.xlsx", vendor_a), ("b.xlsx", vendor_b)], parallel=False)
+
+    assert list(tender.labels.columns) == ["Scope"]
+    assert list(tender.labels["Scope"]) == ["WP1", "WP2", "WP3", "WP4"]
+    assert list(tender.vendors) == ["A", "B"]
+    got = prices_by_scope(tender)
+    assert got["WP1"]["A"] == 100 and np.isnan(got["WP1"]["B"])
+    assert got["WP2"] == {"A": 200, "B": 210}
+    assert got["WP3"] == {"A": 330, "B": 290}
+    assert np.isnan(got["WP4"]["A"]) and got["WP4"]["B"] == 50
+
+
+def test_region_sheets_keep_the_same_scope_apart():
+    # WP2 dengan harga beda dan WP1 dengan harga sama di dua region
+    vendor_a = workbook(North=[["Scope", "A"], ["WP1", 100], ["WP2", 200]],
+                        South=[["Scope", "A"], ["WP1", 100], ["WP2", 250]])
+    vendor_b = workbook(North=[["Scope", "B"], ["WP1", 90], ["WP2", 210]],
+                        South=[["Scope", "B"], ["WP2", 240]])
+
+    tender = consolidate_tenders([("a.xlsx", vendor_a), ("b.xlsx", vendor_b)], parallel=False)
+
+    labels = tender.labels.astype(str)
+    assert list(labels.columns) == ["Sheet", "Scope"]
+    assert list(zip(labels["Sheet"], labels["Scope"])) == [
+        ("North", "WP1"), ("North", "WP2"), ("South", "WP1"), ("South", "WP2"),
+    ]
+    assert list(tender.vendors) == ["A", "B"]
+    assert tender.prices[:, 0].tolist() == [100, 200, 100, 250]
+    assert tender.prices[[0, 1, 3], 1].tolist() == [90, 210, 240]
+    assert np.isnan(tender.prices[2, 1])
+
+
+def test_sheet_column_clash_is_an_error():
+    data = workbook(North=[["Sheet", "Scope", "A"], ["x", "WP1", 100]],
+                    South=[["Sheet", "Scope", "A"], ["x", "WP1", 100]])
+    with pytest.raises(TenderFormatError, match='"Sheet" column clashes'):
+        consolidate_tenders([("a.xlsx", data)], parallel=False)
+
+
+def test_repeated_scope_in_one_sheet_stays_two_rows():
+    data = workbook(S=[["Scope", "A"], ["WP1", 100], ["WP1", 120]])
+    other = workbook(S=[["Scope", "B"], ["WP1", 90], ["WP1", 130]])
+    tender = consolidate_tenders([("a.xlsx", data), ("b.xlsx", other)], parallel=False)
+    assert tender.prices.tolist() == [[100, 90], [120, 130]]
+
+
+def test_same_price_in_two_files_is_not_a_clash():
+    data = workbook(S=[["Scope", "A"], ["WP1", 100]])
+    tender = consolidate_tenders([("a.xlsx", data), ("copy.xlsx", data)], parallel=False)
+    assert tender.prices.tolist() == [[100]]
+
+
+def test_conflicting_price_for_same_vendor_is_an_error():
+    first = workbook(S=[["Scope", "A"], ["WP1", 100]])
+    second = workbook(S=[["Scope", "A"], ["WP1", 150]])
+    with pytest.raises(TenderFormatError, match="A has a different price for WP1"):
+        consolidate_tenders([("a.xlsx", first), ("b.xlsx", second)], parallel=False)
+
+
+def test_mismatched_key_columns_are_an_error():
+    first = workbook(S=[["Scope", "A"], ["WP1", 100]])
+    second = workbook(S=[["Item", "B"], ["WP1", 150]])
+    with pytest.raises(TenderFormatError, match="do not match"):
+        consolidate_tenders([("a.xlsx", first), ("b.xlsx", second)], parallel=False)
+
+
+def test_format_errors_name_the_sheet():
+    bad = workbook(Broken=[["Scope", "No", "A"], ["WP1", 1, 100]])
+    with pytest.raises(TenderFormatError, match="bad.xlsx / Broken"):
+        consolidate_tenders([("bad.xlsx", bad)], parallel=False)
+
+
+def test_unreadable_workbook_names_the_file():
+    good = workbook(S=[["Scope", "A"], ["WP1", 100]])
+    with pytest.raises(TenderFormatError, match="^broken.xlsx: The file is not a readable"):
+        consolidate_tenders([("good.xlsx", good), ("broken.xlsx", b"not a workbook")],
+                            parallel=False)
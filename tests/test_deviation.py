@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from deviation import RANK_METHODS, best_rank_mask, rank_prices, rank_tables_from_arrays
+
+
+def tie_heavy_prices(seed=0, n_rows=500, n_vendors=6):
+    rng = np.random.default_rng(seed)
+    prices = rng.integers(1, 6, (n_rows, n_vendors)).astype(np.float64)
+    prices[rng.random(prices.shape) < 0.25] = np.nan
+    prices[0] = np.nan  # tidak ada yang menawar
+    return prices
+
+
+@pytest.mark.parametrize("method", RANK_METHODS)
+def test_rank_prices_matches_pandas_rank(method):
+    prices = tie_heavy_prices()
+    ranks, order, n_bids = rank_prices(prices, method)
+
+    expected = pd.DataFrame(prices).rank(axis=1, method=method).to_numpy()
+    np.testing.assert_array_equal(ranks, expected)
+    np.testing.assert_array_equal(n_bids, (~np.isnan(prices)).sum(axis=1))
+    # order: harga naik, NaN di belakang
+    sorted_prices = np.take_along_axis(prices, order, axis=1)
+    assert (np.diff(np.nan_to_num(sorted_prices, nan=1e18), axis=1) >= 0).all()
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError, match="Unknown rank method"):
+        rank_prices(np.ones((2, 2)), "max")
+
+
+def summary_of(prices, method):
+    key = pd.DataFrame({"Scope": [f"WP{i}" for i in range(len(prices))]})
+    return rank_tables_from_arrays(key, ["A", "B", "C", "D"], np.asarray(prices, dtype=float), method)
+
+
+def test_summary_follows_tie_method():
+    prices = [[100, 100, 150, np.nan]]
+
+    _, _, summary, _, _ = summary_of(prices, "min")
+    assert summary.loc[0, "1st Rank"] == "A, B"
+    assert pd.isna(summary.loc[0, "2nd Rank"])
+    assert summary.loc[0, "3rd Rank"] == "C"
+    assert summary.loc[0, "Dev. 3rd to 1st (%)"] == 50.0
+    assert pd.isna(summary.loc[0, "4th Rank"])
+
+    _, _, summary, _, _ = summary_of(prices, "dense")
+    assert summary.loc[0, "2nd Rank"] == "C"
+
+    _, _, summary, _, _ = summary_of(prices, "first")
+    assert summary.loc[0, ["1st Rank", "2nd Rank", "3rd Rank"]].tolist() == ["A", "B", "C"]
+    assert summary.loc[0, "Dev. 2nd to 1st (%)"] == 0.0
+
+
+def expected_summary_names(prices, vendors, method):
+    """Referensi per baris: vendor per kolom rank, yang tie digabung "A, B"."""
+    ranks = pd.DataFrame(prices).rank(axis=1, method="min" if method == "average" else method)
+    out = []
+    for row in ranks.to_numpy():
+        slots = [[] for _ in vendors]
+        for j in np.argsort(row, kind="stable"):
+            if not np.isnan(row[j]):
+                slots[int(row[j]) - 1].append(vendors[j])
+        out.append([", ".join(names) if names else None for names in slots])
+    return out
+
+
+@pytest.mark.parametrize("n_vendors", [6, 70])  # 70: bitmask lebih dari satu word
+@pytest.mark.parametrize("method", ["min", "dense", "average"])
+def test_summary_tie_names_match_row_by_row_reference(method, n_vendors):
+    prices = tie_heavy_prices(n_rows=200, n_vendors=n_vendors)
+    vendors = [f"V{i}" for i in range(n_vendors)]
+    key = pd.DataFrame({"Scope": [f"WP{i}" for i in range(len(prices))]})
+    summary = rank_tables_from_arrays(key, vendors, prices, method)[2]
+
+    rank_cols = [c for c in summary.columns if c.endswith(" Rank")]
+    got = summary[rank_cols].astype(object).where(summary[rank_cols].notna(), None)
+    assert got.values.tolist() == expected_summary_names(prices, vendors, method)
+
+
+def test_best_rank_mask_marks_every_tied_winner():
+    bid_rank, *_ = summary_of([[100, 100, 150, np.nan], [5, 4, 3, 2]], "min")
+    mask = best_rank_mask(bid_rank)
+    assert mask[:, 1:].tolist() == [[True, True, False, False], [False, False, False, True]]
+    assert not mask[:, 0].any()  # kolom Scope
+
+
+def test_non_bidders_stay_blank():
+    bid_rank, rank_dev, summary, _, _ = summary_of([[np.nan, 200, 100, np.nan]], "min")
+    assert bid_rank.loc[0, ["A", "B", "C", "D"]].isna().tolist() == [True, False, False, True]
+    assert rank_dev.loc[0, "B"] == 100.0
+    assert summary.loc[0, ["1st Rank", "2nd Rank"]].tolist() == ["C", "B"]
+    assert summary.loc[0, ["3rd Rank", "4th Rank"]].isna().all()
+
+
+def test_price_statistics_match_pandas():
+    rng = np.random.default_rng(5)
+    prices = rng.uniform(1e5, 1e7, (400, 7)).round()
+    prices[rng.random(prices.shape) < 0.3] = np.nan
+    prices[0] = np.nan
+    prices[1, 1:] = np.nan  # satu bidder
+    key = pd.DataFrame({"Scope": [f"WP{i}" for i in range(len(prices))]})
+    stats = rank_tables_from_arrays(key, list("ABCDEFG"), prices)[3]
+
+    df = pd.DataFrame(prices)
+    np.testing.assert_array_equal(stats["Bidders"], df.count(axis=1))
+    np.testing.assert_allclose(stats["Mean Price"], df.mean(axis=1))
+    np.testing.assert_allclose(stats["Median Price"], df.median(axis=1))
+    np.testing.assert_allclose(stats["Std. Deviation"], df.std(axis=1))
+    np.testing.assert_allclose(stats["CV (%)"], df.std(axis=1) / df.mean(axis=1) * 100)
+    np.testing.assert_allclose(stats["Q1"], df.quantile(0.25, axis=1))
+    np.testing.assert_allclose(stats["Q3"], df.quantile(0.75, axis=1))
+
+
+def test_outlier_flags():
+    prices = [
+        [100, 100, 100, 100, 100, 100, 1000],  # z dan IQR
+        [100, 100, 100, 100, 100, 100, 100],  # semua sama: tidak ada outlier
+        [100, 200, np.nan, np.nan, np.nan, np.nan, np.nan],  # 2 bidder
+        [10, 100, 101, 102, 103, np.nan, np.nan],  # jauh di bawah: IQR saja (5 bidder)
+    ]
+    key = pd.DataFrame({"Scope": ["WP1", "WP2", "WP3", "WP4"]})
+    _, _, _, stats, flags = rank_tables_from_arrays(key, list("ABCDEFG"), np.array(prices, dtype=float))
+
+    assert flags.loc[0, "G"] == "High (z, IQR)"
+    assert flags.loc[0, list("ABCDEF")].isna().all()
+    assert flags.loc[3, "A"] == "Low (IQR)"
+    assert stats["Outliers"].tolist() == [1, 0, 0, 1]
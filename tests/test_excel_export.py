@@ -0,0 +1,80 @@
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from excel_export import (
+    RANK_DEV_SHEET,
+    RESULT_SHEETS,
+    export_excel_file,
+    generate_multi_sheet_excel,
+    number_width,
+    text_width,
+)
+from tender import TenderTable
+
+
+def test_text_width_of_categorical_ignores_blanks_and_unused_categories():
+    series = pd.Series(pd.Categorical(["ab", None, "abcd"], categories=["ab", "abcd", "x" * 40]))
+    assert text_width(series) == 4
+    assert text_width(pd.Series(pd.Categorical([None, None]))) == 0
+
+
+def test_text_width_of_object_column():
+    assert text_width(pd.Series(["a", None, "abc"], dtype=object)) == 3
+
+
+def test_number_width_matches_displayed_text():
+    assert number_width(np.array([1234567.0, np.nan]), "rp") == len("1.234.567")
+    assert number_width(np.array([-12.34]), "pct") == len("-12,3%")
+    assert number_width(np.array([1.0, 2.0, 3.0]), "rank") == 1
+    assert number_width(np.array([1.5, 12.0]), "rank") == len("12.5")
+
+
+def cell_styles(workbook):
+    """(sheet, koordinat) -> (nilai, number format, warna fill, bold) semua sel."""
+    out = {}
+    for ws in workbook.worksheets:
+        for row in ws.iter_rows():
+            for cell in row:
+                out[ws.title, cell.coordinate] = (
+                    cell.value, cell.number_format, cell.fill.fgColor.rgb, cell.font.b,
+                )
+    return out
+
+
+def column_layout(workbook):
+    return {
+        (ws.title, letter): dim.width
+        for ws in workbook.worksheets for letter, dim in ws.column_dimensions.items()
+    }
+
+
+@pytest.mark.parametrize("method", ["min", "average"])
+def test_streamed_file_matches_in_memory_workbook(tmp_path, method):
+    df = pd.DataFrame({
+        "Scope": ["WP1", "WP2", "WP3", "WP4", "WP5"],
+        "Desc": ["Pipe", None, "Valve", "Pump", "Cable"],
+        "A": [100.0, 150.0, np.nan, 250.0, 80.5],
+        "B": [100.0, 120.0, 400.0, 250.0, 99.0],  # WP1 & WP4: tie di rank 1
+        "C": [130.0, np.nan, 390.0, 260.0, 80.5],
+    })
+    tables = TenderTable.from_frame(df).rank_tables(method)
+    sheets = dict(zip(RESULT_SHEETS, tables))
+
+    in_memory = openpyxl.load_workbook(BytesIO(generate_multi_sheet_excel(RESULT_SHEETS, sheets)))
+    path = export_excel_file(RESULT_SHEETS, sheets, tmp_path / "export.xlsx")
+    streamed = openpyxl.load_workbook(path)
+
+    assert streamed.sheetnames == in_memory.sheetnames == list(RESULT_SHEETS)
+    assert cell_styles(streamed) == cell_styles(in_memory)
+    assert column_layout(streamed) == column_layout(in_memory)
+
+    # highlight ikut hasil ranking: kedua vendor yang tie di WP1 ditandai
+    ws = streamed[RANK_DEV_SHEET]
+    fills = [[cell.fill.fgColor.rgb == "FFD9EAD3" for cell in row[2:]] for row in ws.iter_rows(min_row=2)]
+    assert fills[0] == [True, True, False]
+    assert fills[3] == [True, True, False]
+    assert fills[4] == [True, False, True]
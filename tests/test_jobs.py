@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from jobs import JobCancelled, PipelineJob, clear_job, submit_job
+
+TIMEOUT = 5
+
+
+def blocking_target(started, release):
+    """Target yang menunggu `release`, sambil terus memanggil job.report."""
+    def target(job, value):
+        job.report("Parsing...", 0.1)
+        started.set()
+        while not release.wait(0.01):
+            job.report("Parsing...", 0.5)
+        job.report("Ranking...", 0.9)
+        return value * 2
+    return target
+
+
+def test_job_reports_progress_and_finishes():
+    started, release = threading.Event(), threading.Event()
+    state = {}
+    job = submit_job(state, "k1", blocking_target(started, release), 21)
+
+    assert started.wait(TIMEOUT)
+    assert job.status == "running" and job.stage == "Parsing..."
+    release.set()
+    assert job.wait(TIMEOUT)
+    assert (job.status, job.result, job.progress) == ("done", 42, 1.0)
+
+
+def test_cancel_stops_at_the_next_report():
+    started, release = threading.Event(), threading.Event()
+    job = submit_job({}, "k1", blocking_target(started, release), 1)
+
+    assert started.wait(TIMEOUT)
+    job.cancel()
+    assert job.wait(TIMEOUT)
+    assert job.status == "cancelled" and job.result is None
+    release.set()
+
+
+def test_new_key_replaces_running_job():
+    started, release = threading.Event(), threading.Event()
+    state = {}
+    first = submit_job(state, "old", blocking_target(started, release), 1)
+    assert started.wait(TIMEOUT)
+
+    # key sama: job yang sedang jalan dipakai ulang, tidak dijalankan lagi
+    assert submit_job(state, "old", blocking_target(started, release), 1) is first
+
+    second = submit_job(state, "new", lambda job: "ok")
+    assert state["pipeline_job"] is second
+    assert first.wait(TIMEOUT) and first.status == "cancelled"
+    assert second.wait(TIMEOUT) and (second.status, second.result) == ("done", "ok")
+    release.set()
+
+
+def test_clear_job_cancels_and_forgets():
+    started, release = threading.Event(), threading.Event()
+    state = {}
+    job = submit_job(state, "k1", blocking_target(started, release), 1)
+    assert started.wait(TIMEOUT)
+
+    clear_job(state)
+    assert "pipeline_job" not in state
+    assert job.wait(TIMEOUT) and job.status == "cancelled"
+    clear_job(state)  # tidak ada job: no-op
+    release.set()
+
+
+def test_failure_is_kept_on_the_job():
+    def target(job):
+        job.report("Parsing...")
+        raise ValueError("bad sheet")
+
+    job = PipelineJob("k1", target)
+    job.run()
+    assert job.status == "failed" and str(job.error) == "bad sheet"
+
+
+def test_report_raises_after_cancel():
+    job = PipelineJob("k1", lambda job: None)
+    job.cancel()
+    with pytest.raises(JobCancelled):
+        job.report("Parsing...")
@@ -0,0 +1,50 @@
+from io import BytesIO
+
+import openpyxl
+import pytest
+
+from loader import TenderFormatError, read_tender, sheet_names
+
+
+def workbook_bytes(rows, start="A1"):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    first = openpyxl.utils.cell.coordinate_from_string(start)
+    top, left = first[1], openpyxl.utils.column_index_from_string(first[0])
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            if value is not None:
+                ws.cell(top + r, left + c, value)
+    out = BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def test_reads_floating_table():
+    data = workbook_bytes([["Scope", "A", "B"], ["WP1", 100, 200], ["WP2", 150, 120]], start="C3")
+    df = read_tender(data)
+    assert list(df.columns) == ["Scope", "A", "B"]
+    assert df["A"].tolist() == [100.0, 150.0]
+    assert df.attrs["anchor"] == "C3"
+
+
+@pytest.mark.parametrize("data", [
+    b"\xd0\xcf\x11\xe0" + b"\0" * 600,  # header OLE (.xls) rusak
+    b"PK\x03\x04 not a zip",
+])
+def test_unreadable_workbook_is_a_format_error(data):
+    with pytest.raises(TenderFormatError, match="not a readable Excel workbook"):
+        read_tender(data)
+    with pytest.raises(TenderFormatError):
+        sheet_names(data)
+
+
+def test_data_below_an_empty_row_is_rejected():
+    data = workbook_bytes([["Scope", "A", "B"], ["WP1", 100, 200], [None], ["WP3", 10, 20]])
+    with pytest.raises(TenderFormatError, match="Cell A4: data continues below the empty row 3"):
+        read_tender(data)
+
+
+def test_trailing_empty_rows_are_ignored():
+    data = workbook_bytes([["Scope", "A", "B"], ["WP1", 100, 200], ["WP2", 150, 120], [None], [None]])
+    assert len(read_tender(data)) == 2
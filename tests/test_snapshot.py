@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from snapshot import SNAPSHOT_VERSION, open_snapshot, save_snapshot, snapshot_dir, trim_snapshots
+from tender import TenderTable
+
+
+def make_table(n_rows=5):
+    df = pd.DataFrame({
+        "Scope": [f"WP{i}" for i in range(n_rows)],
+        "Item": pd.Series([101, "A-2", None, 101, 7][:n_rows], dtype=object),
+        "A": np.arange(n_rows, dtype=np.float64) * 100,
+        "B": [120.0, np.nan, 50.0, 10.0, 90.0][:n_rows],
+    })
+    return TenderTable.from_frame(df)
+
+
+def test_round_trip_keeps_labels_and_prices(tmp_path):
+    table = make_table()
+    save_snapshot("k1", table, tmp_path)
+    loaded = open_snapshot("k1", tmp_path)
+
+    assert loaded.labels.equals(table.labels)
+    assert loaded.labels["Item"].tolist()[:2] == [101, "A-2"]  # angka tetap angka
+    assert list(loaded.labels["Scope"].cat.categories) == list(table.labels["Scope"].cat.categories)
+    np.testing.assert_array_equal(loaded.prices, table.prices)
+    assert list(loaded.vendors) == ["A", "B"]
+    assert loaded.changed_rows(table).size == 0
+
+
+def test_old_version_is_ignored_and_replaced(tmp_path):
+    table = make_table()
+    path = save_snapshot("k1", table, tmp_path)
+    meta = json.loads((path / "meta.json").read_text())
+    meta["version"] = SNAPSHOT_VERSION - 1
+    (path / "meta.json").write_text(json.dumps(meta))
+
+    assert open_snapshot("k1", tmp_path) is None
+    save_snapshot("k1", table, tmp_path)
+    assert open_snapshot("k1", tmp_path) is not None
+
+
+def test_trim_removes_least_recently_opened(tmp_path):
+    for key in ("old", "new"):
+        save_snapshot(key, make_table(), tmp_path)
+    (tmp_path / "store").mkdir()  # folder lain di cache dir tidak disentuh
+    open_snapshot("new", tmp_path)
+    size = sum(f.stat().st_size for f in snapshot_dir("new", tmp_path).iterdir())
+
+    trim_snapshots(tmp_path, max_bytes=size)
+
+    assert not snapshot_dir("old", tmp_path).exists()
+    assert open_snapshot("new", tmp_path) is not None
+    assert (tmp_path / "store").exists()
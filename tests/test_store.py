@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import store as store_module
+from store import SharedStore
+from tender import TenderTable
+
+
+def make_table():
+    df = pd.DataFrame({
+        "Scope": ["WP1", "WP2", "WP3"],
+        "A": [100.0, 150.0, np.nan],
+        "B": [120.0, 150.0, 90.0],
+    })
+    return TenderTable.from_frame(df)
+
+
+def test_shared_tables_are_read_only():
+    store = SharedStore()
+    table = store.put(("table", "k"), make_table())
+    tables = store.put(("rank", "k", "min"), table.rank_tables("min"))
+    tables = store.get(("rank", "k", "min"))
+
+    for df in tables:
+        for i in range(df.shape[1]):
+            with pytest.raises(ValueError):
+                df.iloc[0, i] = df.iloc[1, i]
+    with pytest.raises(ValueError):
+        table.prices[0, 0] = 1.0
+    with pytest.raises(ValueError):
+        table.labels.iloc[0, 0] = "WP2"
+
+
+def test_frozen_tables_keep_values_and_still_splice():
+    table = make_table()
+    expected = table.rank_tables("min")
+    store = SharedStore()
+    frozen = store.put(("rank", "k", "min"), table.rank_tables("min"))
+    for got, want in zip(frozen, expected):
+        pd.testing.assert_frame_equal(got, want)
+
+    changed = TenderTable(table.labels, table.vendors, table.prices.copy())
+    changed.prices[1, 0] = 10.0
+    for got, want in zip(changed.update_rank_tables(table, frozen, "min"), changed.rank_tables("min")):
+        # kategori yang tidak terpakai boleh beda
+        pd.testing.assert_frame_equal(got.astype(object), want.astype(object))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_pinned_entries_are_evicted_last(monkeypatch):
+    monkeypatch.setattr(store_module.time, "monotonic", Clock())
+    store = SharedStore(max_bytes=250)
+    store.put("a", b"x" * 100)
+    store.put("b", b"x" * 100)
+    store.pin("session-1", ["a"])
+    store.put("c", b"x" * 100)  # "a" paling lama, tapi dipegang -> "b" yang keluar
+    assert store.get("a") is not None
+    assert store.get("b") is None
+    assert store.stats()["pinned"] == 1
+
+
+def test_expired_leases_are_dropped(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(store_module.time, "monotonic", clock)
+    store = SharedStore(max_bytes=250, lease_seconds=60)
+    store.put("a", b"x" * 100)
+    store.pin("gone", ["a"])
+    store.pin("active", [])
+    assert store.stats()["sessions"] == 2
+
+    clock.now += 30
+    store.pin("active", ["b"])  # memperpanjang lease "active" saja
+    clock.now += 40
+    store.pin("other", [])
+    assert set(store.leases) == {"active", "other"}
+    assert store.stats() == {"entries": 1, "bytes": 100, "pinned": 0, "sessions": 2}
+
+    # "a" tidak dipegang lagi, jadi keluar duluan
+    store.put("b", b"x" * 100)
+    store.put("c", b"x" * 100)
+    assert store.get("a") is None and store.get("b") is not None
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from styling import format_rupiah, format_rupiah_array, format_rupiah_percent, rupiah_formatters
+
+EDGE_VALUES = [
+    0.0, -0.0, 7000.0, 1234567.0, -1234567.0, 0.5, 0.005, 0.015, 1.005, 2.675, -0.001,
+    999.999, 1e12 + 0.25, 1e13, 1e15, 123456789.12, -98.76, np.nan, np.inf, -np.inf,
+]
+
+
+def expected(values, percent):
+    fn = format_rupiah_percent if percent else format_rupiah
+    return np.array([fn(v) for v in values], dtype=object)
+
+
+@pytest.mark.parametrize("percent", [False, True])
+def test_matches_per_cell_formatter_on_edge_values(percent):
+    values = np.array(EDGE_VALUES)
+    np.testing.assert_array_equal(format_rupiah_array(values, percent), expected(values, percent))
+
+
+@pytest.mark.parametrize("percent", [False, True])
+def test_matches_per_cell_formatter_on_random_values(percent):
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        rng.uniform(-1e9, 1e9, 3000).round(),
+        rng.uniform(-1e9, 1e9, 3000).round(2),
+        rng.uniform(-1e6, 1e6, 3000),
+        rng.uniform(-1, 1, 2000),
+        rng.integers(0, 10**12, 2000).astype(np.float64),
+    ])
+    values[rng.random(values.size) < 0.05] = np.nan
+    np.testing.assert_array_equal(format_rupiah_array(values, percent), expected(values, percent))
+
+
+def test_keeps_shape_of_2d_input():
+    values = np.array([[1000.0, np.nan], [2.5, -3.0]])
+    assert format_rupiah_array(values).tolist() == [["1.000", ""], ["2,50", "-3"]]
+
+
+def test_formatters_keep_numbers_under_the_styler():
+    df = pd.DataFrame({
+        "Scope": ["WP1", "WP2", "WP3"],
+        "Price": [9.0, 1234567.5, np.nan],
+        "Dev": [10.0, 0.0, 2.675],
+    })
+    styled = df.style.format(rupiah_formatters(df, ["Price"], ["Dev"]))
+
+    assert styled.data["Price"].dtype == np.float64  # sort di st.dataframe tetap numeric
+    html = styled.to_html()
+    for text in ["9", "1.234.567,50", "10%", "0%", format_rupiah_percent(2.675)]:
+        assert f">{text}</td>" in html
+    assert "nan" not in html
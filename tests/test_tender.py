@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from deviation import RANK_METHODS
+from tender import TenderTable
+
+
+def make_tender(prices):
+    n_rows = len(prices)
+    df = pd.concat(
+        [pd.DataFrame({"Scope": [f"WP{i}" for i in range(n_rows)]}),
+         pd.DataFrame(prices, columns=[f"Vendor {c}" for c in "ABCDE"[:prices.shape[1]]])],
+        axis=1,
+    )
+    return TenderTable.from_frame(df)
+
+
+def random_prices(rng, n_rows=300, n_vendors=5):
+    # harga bulat kecil supaya banyak tie
+    prices = rng.integers(1, 8, (n_rows, n_vendors)).astype(np.float64) * 1000
+    prices[rng.random(prices.shape) < 0.2] = np.nan
+    return prices
+
+
+def assert_tables_equal(got, want):
+    assert len(got) == len(want)
+    for a, b in zip(got, want):
+        # kategori yang tidak terpakai boleh beda
+        pd.testing.assert_frame_equal(a.astype(object), b.astype(object))
+
+
+@pytest.mark.parametrize("method", RANK_METHODS)
+def test_incremental_update_equals_full_recompute(method):
+    rng = np.random.default_rng(1)
+    prices = random_prices(rng)
+    old = make_tender(prices)
+    old_tables = old.rank_tables(method)
+
+    changed = prices.copy()
+    rows = rng.choice(len(prices), 40, replace=False)
+    changed[rows, 1] = rng.integers(1, 8, 40) * 1000.0
+    changed[rows[:5], 2] = np.nan  # vendor berhenti menawar
+    new = make_tender(changed)
+
+    assert set(new.changed_rows(old)) <= set(rows)
+    assert_tables_equal(new.update_rank_tables(old, old_tables, method), new.rank_tables(method))
+
+
+def test_unchanged_upload_reuses_previous_tables():
+    prices = random_prices(np.random.default_rng(2))
+    old = make_tender(prices)
+    old_tables = old.rank_tables()
+    assert make_tender(prices.copy()).update_rank_tables(old, old_tables) is old_tables
+
+
+def test_structure_change_falls_back_to_full_recompute():
+    rng = np.random.default_rng(3)
+    old = make_tender(random_prices(rng, n_vendors=4))
+    new = make_tender(random_prices(rng, n_vendors=5))
+    assert new.changed_rows(old) is None
+    assert_tables_equal(new.update_rank_tables(old, old.rank_tables()), new.rank_tables())
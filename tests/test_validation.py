@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from validation import validate_table
+
+
+def tender(**vendors):
+    n_rows = len(next(iter(vendors.values())))
+    df = pd.DataFrame({"Scope": [f"WP{i + 1}" for i in range(n_rows)]})
+    for name, prices in vendors.items():
+        df[name] = np.asarray(prices, dtype=np.float64)
+    return df
+
+
+def messages(df):
+    return [issue.message for issue in validate_table(df)]
+
+
+def test_valid_tender_has_no_issues():
+    df = tender(A=[100, 150, 300, 120], B=[200, 250, 400, 130], C=[180, 260, 390, 110])
+    assert validate_table(df) == []
+
+
+def test_sparse_vendor_tied_with_only_other_bidder_is_not_total():
+    df = tender(A=[100, 150, np.nan, 120], B=[200, 250, 400, 130], C=[np.nan, np.nan, 400, np.nan])
+    assert validate_table(df) == []
+
+
+def test_total_column_is_rejected():
+    df = tender(A=[100, 150, np.nan, 120], B=[200, 250, 400, 130], C=[50, 70, 90, 60])
+    df["Sum"] = df[["A", "B", "C"]].sum(axis=1)
+    issues = validate_table(df)
+    assert [(i.row, i.col) for i in issues] == [(0, 4)]
+    assert "TOTAL column" in issues[0].message
+
+
+def test_total_row_is_rejected():
+    df = tender(A=[100, 150, np.nan, 250], B=[200, 250, 400, 850])
+    issues = validate_table(df)
+    assert [(i.row, i.col) for i in issues] == [(4, 0)]
+    assert "TOTAL row" in issues[0].message
+
+
+def test_small_prices_are_not_total_rows():
+    # harga satuan / nilai dalam juta: selisih < 0.5 bukan berarti sama
+    df = tender(A=[.2, .2, .3], B=[.1, .1, .1])
+    assert validate_table(df) == []
+
+
+def test_total_row_of_small_prices_is_rejected():
+    df = tender(A=[.2, .35, .15, .7], B=[.1, .12, .08, .3])
+    issues = validate_table(df)
+    assert [(i.row, i.col) for i in issues] == [(4, 0)]
+    assert "TOTAL row" in issues[0].message
+
+
+def test_row_number_column_is_rejected():
+    df = tender(Item=[1, 2, 3, 4], A=[100, 150, 300, 120], B=[200, 250, 400, 130])
+    assert any("1..N row number column" in m for m in messages(df))
+
+
+def test_text_in_vendor_column_reports_the_cell():
+    df = tender(A=[100, 150, 300, 120], B=[200, 250, 400, 130])
+    df["B"] = df["B"].astype(object)
+    df.loc[2, "B"] = "n/a"
+    issues = validate_table(df, top=3, left=1)
+    assert [(i.row, i.col) for i in issues] == [(6, 3)]
+
+
+def test_text_column_after_vendors_is_rejected():
+    df = tender(A=[100, 150, 300, 120], B=[200, 250, 400, 130])
+    df["Note"] = ["x", "y", "z", "w"]
+    assert any("comes after numeric columns" in m for m in messages(df))
@@ -0,0 +1,174 @@
+"""
+Cek struktur tabel tender sesuai Constraint di halaman guide, sekali jalan
+di atas array per kolom hasil loader (tanpa loop per sel untuk kolom angka):
+
+  1. COLUMN ORDER   non-numeric -> numeric, tidak boleh kolom teks di area vendor
+  2. NUMBER COLUMN  kolom angka berisi 1..N (kolom "No" dengan nama lain)
+  3. TOTAL          kolom / baris yang nilainya = jumlah kolom / baris lain
+
+Semua posisi 0-based relatif ke sheet (sudah ditambah posisi anchor).
+"""
+from collections import namedtuple
+
+import numpy as np
+
+Issue = namedtuple("Issue", ["row", "col", "message"])
+
+# tipe angka yang dihasilkan openpyxl / pandas (bool sengaja tidak masuk)
+NUMBER_TYPES = frozenset((int, float, np.int64, np.float64))
+# toleransi perbandingan TOTAL, relatif terhadap jumlahnya (pembulatan di
+# Excel); absolutnya hanya untuk noise float, karena harga bisa < 1 (harga
+# satuan, nilai dalam juta)
+TOTAL_RTOL = 1e-6
+TOTAL_ATOL = 1e-9
+# TOTAL harus terisi di hampir semua baris yang punya penawaran lain dan cocok
+# di beberapa sel; vendor jarang menawar yang kebetulan sama dengan satu-satunya
+# penawar lain (tie) bukan TOTAL
+TOTAL_MIN_COVERAGE = 0.9
+TOTAL_MIN_MATCHES = 3
+MAX_CELLS_PER_COLUMN = 5
+
+
+def number_cells(values):
+    """Mask sel yang berisi angka (bukan bool); None dianggap kosong."""
+    if values.dtype == np.float64:
+        return ~np.isnan(values)
+    # map di level C, jauh lebih cepat dari isinstance per sel
+    return np.fromiter(
+        map(NUMBER_TYPES.__contains__, map(type, values)), dtype=bool, count=len(values)
+    )
+
+
+def column_profile(df):
+    """
+    Per kolom: (is_numeric, number_mask, filled_mask). Kolom dianggap numeric
+    kalau mayoritas sel terisi berisi angka, jadi satu sel teks nyasar di kolom
+    vendor dilaporkan sebagai sel, bukan sebagai kolom yang salah tempat.
+    """
+    profile = []
+    for col in df.columns:
+        values = df[col].to_numpy()
+        numbers = number_cells(values)
+        if values.dtype == np.float64:
+            filled = numbers
+        else:
+            filled = np.not_equal(values, None)
+        n_filled = filled.sum()
+        profile.append((n_filled > 0 and numbers.sum() * 2 > n_filled, numbers, filled))
+    return profile
+
+
+def check_column_order(df, profile, first_num, top, left):
+    issues = []
+    for c in range(first_num, len(df.columns)):
+        is_num, numbers, filled = profile[c]
+        if not is_num:
+            issues.append(Issue(
+                top, left + c,
+                f'non-numeric column "{df.columns[c]}" comes after numeric columns '
+                "(non-numeric columns must come first).",
+            ))
+            continue
+        # sel teks di kolom angka
+        for r in np.flatnonzero(filled & ~numbers)[:MAX_CELLS_PER_COLUMN]:
+            issues.append(Issue(top + 1 + r, left + c, "text value in a numeric (vendor) column."))
+    return issues
+
+
+def check_sequence_columns(df, prices, price_cols, top, left):
+    """Kolom angka yang isinya persis 1, 2, ..., N."""
+    n_rows = prices.shape[0]
+    if n_rows < 3:
+        return []
+    # hanya kolom yang mulai dari 1 yang dicek penuh
+    candidates = np.flatnonzero(prices[0] == 1)
+    expected = np.arange(1, n_rows + 1, dtype=np.float64)[:, None]
+    hits = candidates[(prices[:, candidates] == expected).all(axis=0)]
+    return [
+        Issue(top, left + price_cols[j],
+              f'column "{df.columns[price_cols[j]]}" is a 1..N row number column; '
+              'a "No" column is not allowed.')
+        for j in hits
+    ]
+
+
+def sum_of_others(prices, totals, axis):
+    """
+    axis=1: mask per kolom yang = jumlah kolom lain (di semua baris).
+    axis=0: mask per baris yang = jumlah baris lain (di semua kolom).
+    `totals` = nansum(prices, axis). NaN (vendor tidak menawar) dihitung 0.
+    Kandidat harus terisi di >= TOTAL_MIN_COVERAGE baris yang punya angka
+    lain, dan cocok (bukan nol) di min(TOTAL_MIN_MATCHES, jumlah baris) sel.
+    """
+    p = prices if axis == 1 else prices.T  # kandidat = kolom p
+    candidates = np.arange(p.shape[1])
+
+    # Cek irisan pertama untuk semua kandidat, sisanya hanya untuk yang lolos
+    # (hampir tidak ada), jadi tidak perlu matriks temporer selebar tabel
+    for part in (slice(0, 1), slice(1, None)):
+        if candidates.size == 0:
+            break
+        x = p[part][:, candidates]
+        # x = total - x  <=>  |2x - total| ~ 0
+        diff = np.abs(2 * x - totals[part, None])
+        ok = (diff <= np.abs(totals[part, None]) * TOTAL_RTOL + TOTAL_ATOL) | np.isnan(x)
+        candidates = candidates[ok.all(axis=0)]
+
+    if candidates.size:
+        x = p[:, candidates]
+        quoted = ~np.isnan(x)
+        # baris yang punya angka lain selain kandidat itu sendiri
+        others = (np.count_nonzero(~np.isnan(p), axis=1)[:, None] - quoted) > 0
+        n_others = others.sum(axis=0)
+        coverage = (quoted & others).sum(axis=0) >= TOTAL_MIN_COVERAGE * n_others
+        matches = (quoted & (x != 0)).sum(axis=0) >= min(TOTAL_MIN_MATCHES, p.shape[0])
+        candidates = candidates[coverage & matches]
+    mask = np.zeros(p.shape[1], dtype=bool)
+    mask[candidates] = True
+    return mask
+
+
+def check_totals(df, prices, price_cols, top, left):
+    issues = []
+    n_rows, n_cols = prices.shape
+    zeroed = np.where(np.isnan(prices), 0.0, prices)  # satu copy untuk kedua arah
+    if n_cols >= 3:
+        for j in np.flatnonzero(sum_of_others(prices, zeroed.sum(axis=1), axis=1)):
+            issues.append(Issue(
+                top, left + price_cols[j],
+                f'column "{df.columns[price_cols[j]]}" equals the sum of the other vendor '
+                "columns; a TOTAL column is not allowed.",
+            ))
+    if n_rows >= 3:
+        for i in np.flatnonzero(sum_of_others(prices, zeroed.sum(axis=0), axis=0)):
+            issues.append(Issue(
+                top + 1 + i, left,
+                "this row equals the sum of the other rows; a TOTAL row is not allowed.",
+            ))
+    return issues
+
+
+def validate_table(df, top=0, left=0):
+    """
+    Semua pelanggaran struktur, urut: column order, kolom 1..N, TOTAL.
+    `top`/`left` = posisi header (anchor) di sheet, untuk koordinat sel.
+    """
+    profile = column_profile(df)
+    numeric = [p[0] for p in profile]
+    if True not in numeric:
+        return [Issue(top, left, "the table has no numeric (vendor) columns.")]
+
+    first_num = numeric.index(True)
+    issues = check_column_order(df, profile, first_num, top, left)
+
+    # hanya kolom vendor yang seluruhnya angka yang ikut cek 1..N & TOTAL
+    price_cols = [
+        c for c in range(first_num, len(df.columns)) if df.iloc[:, c].dtype == np.float64
+    ]
+    if not price_cols:
+        return issues
+
+    prices = np.column_stack([df.iloc[:, c].to_numpy() for c in price_cols])
+    issues += check_sequence_columns(df, prices, price_cols, top, left)
+    issues += check_totals(df, prices, price_cols, top, left)
+    return issues
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import profiling
+from deviation import is_number_column
+from styling import highlight_min_cells, rupiah_formatters
+
+PAGE_SIZE = 100
+
+
+def filter_rows(df, query):
+    """Index baris yang kolom teksnya mengandung `query` (case-insensitive)."""
+    if not query:
+        return np.arange(len(df))
+
+    mask = np.zeros(len(df), dtype=bool)
+    for col in df.columns:
+        if not is_number_column(df[col]):
+            mask |= (
+                df[col].astype("string")
+                .str.contains(query, case=False, regex=False, na=False)
+                .to_numpy(dtype=bool)
+            )
+    return np.flatnonzero(mask)
+
+
+def sort_rows(df, rows, column, descending=False):
+    """Urutkan index `rows` berdasarkan satu kolom (NaN angka selalu di bawah)."""
+    if is_number_column(df[column]):
+        values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+        keys = -values if descending else values
+        order = np.argsort(keys, kind="stable")
+    else:
+        values = df[column].to_numpy()[rows]
+        text = pd.Series(values).astype("string").fillna("").to_numpy(dtype=str)
+        order = np.argsort(text, kind="stable")
+        if descending:
+            order = order[::-1]
+    return rows[order]
+
+
+def style_page(page, rupiah_cols=(), percent_cols=(), highlight_mask=None):
+    """Format + highlight hanya untuk baris yang sedang tampil."""
+    styled = page.style.format(rupiah_formatters(page, rupiah_cols, percent_cols))
+    if highlight_mask is not None:
+        styled = styled.apply(highlight_min_cells, axis=None, mask=highlight_mask)
+    return styled
+
+
+def paged_table(df, key, rupiah_cols=(), percent_cols=(), highlight_mask=None, page_size=PAGE_SIZE):
+    """
+    st.dataframe per halaman. Filter & sort dihitung di server atas array asli,
+    jadi biaya format Rupiah dan Styler cuma O(page), bukan O(tabel).
+    highlight_mask: bool (n_rows x n_cols) sel yang diwarnai, mis. best_rank_mask.
+    """
+    if len(df) <= page_size:
+        st.dataframe(
+            style_page(df, rupiah_cols, percent_cols, highlight_mask),
+            hide_index=True
+        )
+        return
+
+    col_filter, col_sort, col_order = st.columns([2, 2, 1])
+    query = col_filter.text_input("Filter", key=f"{key}_filter", placeholder="Search scope...")
+    sort_by = col_sort.selectbox(
+        "Sort by", ["(original order)"] + list(df.columns), key=f"{key}_sort"
+    )
+    descending = col_order.toggle("Descending", key=f"{key}_desc")
+
+    rows = filter_rows(df, query)
+    if sort_by != "(original order)":
+        rows = sort_rows(df, rows, sort_by, descending)
+
+    n_pages = max(1, -(-len(rows) // page_size))
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = 1  # hasil filter lebih sedikit
+    page_no = st.number_input(
+        f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, key=f"{key}_page"
+    )
+    start = (page_no - 1) * page_size
+    page_rows = rows[start:start + page_size]
+    page = df.iloc[page_rows]
+    page_mask = None if highlight_mask is None else highlight_mask[page_rows]
+
+    st.dataframe(
+        style_page(page, rupiah_cols, percent_cols, page_mask),
+        hide_index=True
+    )
+    st.caption(
+        f"Rows {start + 1 if len(rows) else 0:,}–{start + len(page):,} "
+        f"of {len(rows):,} (total {len(df):,})"
+    )
+
+
+def timing_panel():
+    """Sidebar debug: waktu, jumlah baris & peak memory per stage (STDDEV_PROFILE=1)."""
+    if not profiling.ENABLED:
+        return
+    with st.sidebar:
+        st.markdown("#### Timing")
+        records = profiling.records()
+        if not records:
+            st.caption("No stages recorded yet.")
+            return
+        timings = pd.DataFrame(records)
+        summary = timings.groupby("stage", sort=False).agg(
+            calls=("seconds", "size"),
+            last_s=("seconds", "last"),
+            total_s=("seconds", "sum"),
+            rows=("rows", "last"),
+            peak_mb=("peak_memory_bytes", "max"),
+        )
+        summary["peak_mb"] = summary["peak_mb"] / 2**20
+        st.dataframe(summary.round(4))
+        if st.button("Clear timings"):
+            profiling.clear()
+            st.rerun()